@@ -0,0 +1,36 @@
+"""Benchmarks for minesweeper rendering under SDL's dummy video driver."""
+from minesweeper_graphics.minesweeper_graphics import Game
+
+_game = None
+
+
+def _headless_game():
+    """One shared headless 100 x 100 game, created on first use."""
+    global _game
+    if _game is None:
+        _game = Game(100, 100, 1000, headless=True)
+        _game.render()
+    return _game
+
+
+def bench_render_full_frame():
+    game = _headless_game()
+
+    def render():
+        game.redraw = True
+        game.render()
+    return render
+
+
+def bench_render_dirty_frame():
+    game = _headless_game()
+
+    def render():
+        game.dirty.update(game.board.flag(10, 10))
+        game.render()
+    return render
+
+
+def bench_render_idle_frame():
+    game = _headless_game()
+    return game.render
@@ -0,0 +1,22 @@
+"""Benchmarks for mastermind scoring."""
+import numpy as np
+
+from mastermind.mastermind import check, check_many
+
+
+def bench_check():
+    return lambda: check([1, 2, 2, 3], [2, 2, 3, 1])
+
+
+def bench_check_many_100k():
+    rng = np.random.default_rng(0)
+    guesses = rng.integers(1, 7, (100000, 4))
+    answers = rng.integers(1, 7, (100000, 4))
+    return lambda: check_many(guesses, answers)
+
+
+def bench_check_many_100k_positional():
+    rng = np.random.default_rng(0)
+    guesses = rng.integers(1, 7, (100000, 4))
+    answers = rng.integers(1, 7, (100000, 4))
+    return lambda: check_many(guesses, answers, positional=True)
@@ -0,0 +1,57 @@
+"""Benchmarks for minesweeper board generation, reveals and moves."""
+import numpy as np
+
+from minesweeper.analytics import metrics
+from minesweeper.board import create_reference, create_references
+from minesweeper.state import Board
+
+
+def _create(m, n, mines):
+    rng = np.random.default_rng(0)
+    return lambda: create_reference(m, n, mines, rng)
+
+
+def bench_create_reference_expert():
+    return _create(16, 30, 99)
+
+
+def bench_create_reference_100x100_sparse():
+    return _create(100, 100, 1000)
+
+
+def bench_create_reference_100x100_dense():
+    return _create(100, 100, 3000)
+
+
+def bench_create_reference_1000x1000():
+    return _create(1000, 1000, 150000)
+
+
+def _cascade(m, n):
+    # all zero board: one click reveals every cell
+    ref_grid = np.zeros((m, n), dtype=np.int8)
+    return lambda: Board(ref_grid).reveal(0, 0)
+
+
+def bench_reveal_cascade_100x100():
+    return _cascade(100, 100)
+
+
+def bench_reveal_cascade_500x500():
+    return _cascade(500, 500)
+
+
+def bench_move_with_win_check():
+    # flag and unflag: each move updates counters and checks for a win
+    board = Board.create(100, 100, 1000, rng=0)
+    return lambda: (board.flag(50, 50), board.flag(50, 50))
+
+
+def bench_create_references_1000_expert():
+    rng = np.random.default_rng(0)
+    return lambda: create_references(1000, 16, 30, 99, rng)
+
+
+def bench_metrics_1000_expert():
+    ref_stack = create_references(1000, 16, 30, 99, 0)
+    return lambda: metrics(ref_stack)
@@ -0,0 +1,63 @@
+"""Start up benchmarks: a fresh interpreter importing each entry point.
+
+Each run imports the module in a python -X importtime subprocess and
+reports the module's cumulative import time from that report, leaving out
+interpreter start up. For the per module breakdown run
+
+    python -m benchmarks.bench_startup [module]
+"""
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_times(module):
+    """Cumulative import seconds of every module loaded by importing module.
+
+    Parsed from the -X importtime report of a fresh interpreter.
+    """
+    report = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True).stderr
+    times = {}
+    for line in report.splitlines():
+        fields = line.split("|")
+        if line.startswith("import time:") and fields[1].strip().isdigit():
+            times[fields[2].strip()] = int(fields[1]) / 1e6
+    return times
+
+
+def _startup(module):
+    def import_time():
+        return import_times(module)[module]
+    import_time.measured = True
+    return import_time
+
+
+def bench_import_cli():
+    return _startup("games.cli")
+
+
+def bench_import_minesweeper():
+    return _startup("minesweeper.minesweeper")
+
+
+def bench_import_mastermind():
+    return _startup("mastermind.mastermind")
+
+
+def bench_import_tictactoe():
+    return _startup("tictactoe.tictactoe")
+
+
+if __name__ == "__main__":
+    modules = sys.argv[1:] or ["games.cli", "minesweeper.minesweeper",
+                               "mastermind.mastermind", "tictactoe.tictactoe"]
+    for module in modules:
+        times = import_times(module)
+        print(f"{module}: {times[module] * 1000:.1f} ms")
+        heaviest = sorted(times.items(), key=lambda item: -item[1])[1:6]
+        for name, seconds in heaviest:
+            print(f"    {name:40s} {seconds * 1000:8.1f} ms")
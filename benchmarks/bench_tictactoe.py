@@ -0,0 +1,21 @@
+"""Benchmarks for tictactoe win checks."""
+from tictactoe.bitboard import Board
+from tictactoe.tictactoe import check
+
+
+def bench_check():
+    # no line, so check does not print
+    state = [1, -1, 1, 1, -1, -1, -1, 1, 0]
+    return lambda: check(state)
+
+
+def bench_bitboard_last_move_15x15():
+    board = Board(15, 15, 5)
+    for square in range(0, 225, 7):
+        board.play(square)
+
+    def move():
+        board.play(113)
+        board.last_move_won()
+        board.undo()
+    return move
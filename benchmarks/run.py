@@ -0,0 +1,105 @@
+"""Run the benchmarks and compare them with a stored baseline.
+
+Each bench_* function in a benchmark module sets up a case and returns the
+callable to time. Results are seconds per call, written as JSON. A callable
+with a true measured attribute is not timed but returns its own seconds,
+for costs that timing the call would bury, e.g. in a subprocess.
+
+    python -m benchmarks.run [--output results.json] [--save-baseline]
+"""
+import argparse
+import importlib
+import json
+import os
+import platform
+import sys
+import timeit
+
+MODULES = ["bench_minesweeper", "bench_graphics", "bench_mastermind",
+           "bench_tictactoe", "bench_startup"]
+BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+def collect(modules=MODULES, match=""):
+    """Yield (name, bench function) for every benchmark, skipping modules
+    whose dependencies are missing."""
+    for module_name in modules:
+        try:
+            module = importlib.import_module(f"benchmarks.{module_name}")
+        except ImportError as error:
+            print(f"skipping {module_name}: {error}", file=sys.stderr)
+            continue
+        for attr in sorted(dir(module)):
+            name = f"{module_name[6:]}.{attr[6:]}"
+            if attr.startswith("bench_") and match in name:
+                yield name, getattr(module, attr)
+
+
+def measure(fn, repeat=5, budget=0.2):
+    """Best time in seconds per call over repeat runs of about budget."""
+    if getattr(fn, "measured", False):
+        return min(fn() for _ in range(0, repeat))
+    timer = timeit.Timer(fn)
+    number, elapsed = timer.autorange()
+    number = max(1, int(number * budget / max(elapsed, 1e-9)))
+    return min(timer.repeat(repeat, number)) / number
+
+
+def run(match="", repeat=5):
+    """Time every benchmark, returning the results record."""
+    results = {}
+    for name, bench in collect(match=match):
+        results[name] = measure(bench(), repeat)
+        print(f"{name:45s} {results[name] * 1e6:12.2f} us", file=sys.stderr)
+    return {"python": platform.python_version(),
+            "machine": platform.machine(),
+            "results": results}
+
+
+def compare(results, baseline, tolerance=0.25):
+    """Ratio to baseline for each benchmark and the names that regressed."""
+    ratios = {}
+    regressions = []
+    for name, seconds in results["results"].items():
+        if name in baseline["results"]:
+            ratios[name] = seconds / baseline["results"][name]
+            if ratios[name] > 1 + tolerance:
+                regressions.append(name)
+    return ratios, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--match", default="",
+                        help="only run benchmarks whose name contains this")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="write results JSON to this file")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown before failing, e.g. 0.25")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="store these results as the new baseline")
+    args = parser.parse_args(argv)
+
+    results = run(args.match, args.repeat)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        return 0
+    if not os.path.exists(args.baseline):
+        print("no baseline to compare with", file=sys.stderr)
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    ratios, regressions = compare(results, baseline, args.tolerance)
+    for name, ratio in sorted(ratios.items()):
+        flag = "  REGRESSION" if name in regressions else ""
+        print(f"{name:45s} {ratio:6.2f}x baseline{flag}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
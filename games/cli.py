@@ -0,0 +1,95 @@
+"""Command line entry point: games <game> [options].
+
+Each subcommand imports its game only when run, so starting one game
+never pays for the others, pygame or the server.
+"""
+import argparse
+
+
+def minesweeper(args):
+    if args.gui:
+        from minesweeper_graphics.minesweeper_graphics import Game
+        Game(args.rows, args.cols, args.mines, stats=args.stats,
+             record=args.record).run()
+    else:
+        from minesweeper.minesweeper import game
+        game(args.rows, args.cols, args.mines, args.stats, args.record)
+
+
+def mastermind(args):
+    from mastermind.mastermind import game
+    game(args.colours, args.pegs, args.stats)
+
+
+def tictactoe(args):
+    from tictactoe.tictactoe import game
+    game(args.computer, args.stats)
+
+
+def server(args):
+    import asyncio
+
+    from games.server import Server
+    try:
+        asyncio.run(Server(args.idle, args.processes).serve(args.host,
+                                                           args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+def parser():
+    """Argument parser with a subcommand per game."""
+    main = argparse.ArgumentParser(prog="games",
+                                   description="Play minesweeper, "
+                                   "mastermind or tic tac toe.")
+    main.add_argument("--stats", metavar="PATH",
+                      help="write timing statistics as JSON to PATH")
+    commands = main.add_subparsers(dest="command", required=True)
+
+    sub = commands.add_parser("minesweeper", help="play minesweeper")
+    sub.add_argument("-m", "--rows", type=int, default=9)
+    sub.add_argument("-n", "--cols", type=int, default=9)
+    sub.add_argument("--mines", type=int, default=10)
+    sub.add_argument("--gui", action="store_true",
+                     help="play in a pygame window")
+    sub.add_argument("--record", metavar="PATH",
+                     help="append each game to a replay log")
+    sub.set_defaults(run=minesweeper)
+
+    sub = commands.add_parser("mastermind", help="play mastermind")
+    sub.add_argument("--colours", type=int, default=6)
+    sub.add_argument("--pegs", type=int, default=4)
+    sub.set_defaults(run=mastermind)
+
+    sub = commands.add_parser("tictactoe", help="play tic tac toe")
+    sub.add_argument("--computer", type=int, choices=[1, -1],
+                     help="let the engine play as p1 (1) or p2 (-1)")
+    sub.set_defaults(run=tictactoe)
+
+    sub = commands.add_parser("server", help="host games over TCP")
+    sub.add_argument("--host", default="127.0.0.1")
+    # games.server.PORT, not imported to keep start up light
+    sub.add_argument("--port", type=int, default=8765)
+    sub.add_argument("--idle", type=float, default=300.0,
+                     help="seconds before an unused session is evicted")
+    sub.add_argument("--processes", type=int,
+                     help="worker processes for generation and hints")
+    sub.set_defaults(run=server)
+    return main
+
+
+def main(argv=None):
+    args = parser().parse_args(argv)
+    path = args.stats
+    if path is not None:
+        from games.instrument import Stats
+        args.stats = Stats()
+    try:
+        args.run(args)
+    finally:
+        if path is not None:
+            args.stats.dump(path)
+
+
+if __name__ == "__main__":
+    main()
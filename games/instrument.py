@@ -0,0 +1,125 @@
+"""Optional timing and profiling hooks for game loops.
+
+Loops take a Stats object, or None (the default) to skip all recording.
+Phases are run through timed(stats, name, fn), which only calls fn when
+stats is None.
+"""
+import json
+import time
+
+# upper edges of the frame time histogram bins in milliseconds
+FRAME_BINS = [0.1, 0.25, 0.5, 1, 2, 4, 8, 16, 33, 66, float("inf")]
+
+
+def timed(stats, name, fn, *args):
+    """Call fn(*args), recording its time under name if stats is given."""
+    if stats is None:
+        return fn(*args)
+    start = time.perf_counter()
+    result = fn(*args)
+    stats.record(name, time.perf_counter() - start)
+    return result
+
+
+class Stats():
+    """Per phase timings, frame time histogram, moves and cells revealed."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        # phase name to [calls, total seconds, max seconds]
+        self.phases = {}
+        self.frames = 0
+        self.frame_hist = [0] * len(FRAME_BINS)
+        self.moves = 0
+        self.revealed = 0
+        self.max_revealed = 0
+        # profiling of the next capture_frames frames
+        self.capture_frames = 0
+        self.profiler = None
+        self.memory = False
+        self.profile = None
+        self.memory_top = None
+
+    def record(self, name, seconds):
+        """Add a timing for a phase."""
+        phase = self.phases.setdefault(name, [0, 0.0, 0.0])
+        phase[0] += 1
+        phase[1] += seconds
+        phase[2] = max(phase[2], seconds)
+
+    def frame(self, seconds):
+        """Record one frame (or loop iteration) of the given length."""
+        self.frames += 1
+        ms = seconds * 1000
+        for k, edge in enumerate(FRAME_BINS):
+            if ms <= edge:
+                self.frame_hist[k] += 1
+                break
+        if self.profiler is not None:
+            self.capture_frames -= 1
+            if self.capture_frames <= 0:
+                self.stop_capture()
+
+    def move(self, revealed=0):
+        """Record one move and the number of cells it revealed."""
+        self.moves += 1
+        self.revealed += revealed
+        self.max_revealed = max(self.max_revealed, revealed)
+
+    def capture(self, frames, memory=False):
+        """Profile the next frames frames with cProfile (and tracemalloc)."""
+        # profilers are imported here to keep them out of game start up
+        import cProfile
+        import tracemalloc
+
+        self.capture_frames = frames
+        self.memory = memory
+        if memory:
+            tracemalloc.start()
+        self.profiler = cProfile.Profile()
+        self.profiler.enable()
+
+    def stop_capture(self, top=20):
+        """Stop profiling, keeping text reports of the top entries."""
+        import io
+        import pstats
+        import tracemalloc
+
+        self.profiler.disable()
+        out = io.StringIO()
+        pstats.Stats(self.profiler, stream=out).sort_stats(
+            "cumulative").print_stats(top)
+        self.profile = out.getvalue()
+        self.profiler = None
+        if self.memory:
+            snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            self.memory_top = [str(s) for s in
+                               snapshot.statistics("lineno")[:top]]
+
+    def summary(self):
+        """All statistics as a dict, ending any capture still running."""
+        if self.profiler is not None:
+            self.stop_capture()
+        elapsed = time.perf_counter() - self.start
+        return {
+            "elapsed": elapsed,
+            "phases": {name: {"calls": calls, "total": total, "max": peak,
+                              "mean": total / calls}
+                       for name, (calls, total, peak) in self.phases.items()},
+            "frames": self.frames,
+            "frame_hist_ms": {str(edge): count for edge, count
+                              in zip(FRAME_BINS, self.frame_hist)},
+            "moves": self.moves,
+            "moves_per_second": self.moves / elapsed if elapsed else 0.0,
+            "revealed_per_move": (self.revealed / self.moves
+                                  if self.moves else 0.0),
+            "max_revealed": self.max_revealed,
+            "profile": self.profile,
+            "memory_top": self.memory_top,
+        }
+
+    def dump(self, path):
+        """Write the summary to a JSON file."""
+        with open(path, "w") as f:
+            json.dump(self.summary(), f, indent=2)
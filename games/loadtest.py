@@ -0,0 +1,142 @@
+"""Load test client for games.server, reporting move latency percentiles.
+
+Opens a number of connections, each playing its share of the sessions with
+random moves, and times every request. With --spawn a server is started in
+the same process first.
+
+    python -m games.loadtest [--sessions 1000] [--connections 50] [--spawn]
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+import numpy as np
+
+from games.server import PORT, Server
+
+# new game arguments used for each game
+NEW_ARGS = {"minesweeper": {"m": 16, "n": 30, "mines": 99},
+            "mastermind": {"cmp": 6, "ln": 4},
+            "tictactoe": {"computer": -1}}
+
+
+class Client():
+    """One connection, timing each request by game and command."""
+
+    def __init__(self, reader, writer, latencies):
+        self.reader = reader
+        self.writer = writer
+        # (game, cmd) to list of seconds
+        self.latencies = latencies
+
+    async def request(self, game, request):
+        """Send a request and wait for its response."""
+        start = time.perf_counter()
+        self.writer.write(json.dumps(request).encode() + b"\n")
+        await self.writer.drain()
+        response = json.loads(await self.reader.readline())
+        self.latencies.setdefault((game, request["cmd"]), []).append(
+            time.perf_counter() - start)
+        return response
+
+    async def new(self, game):
+        response = await self.request(game, {"cmd": "new", "game": game,
+                                             "args": NEW_ARGS[game]})
+        return response["session"], response
+
+    async def play(self, game, moves, rng):
+        """Play moves random moves, starting new games as they finish."""
+        session, info = await self.new(game)
+        for _ in range(0, moves):
+            if game == "minesweeper":
+                args = [rng.randrange(info["m"]), rng.randrange(info["n"])]
+                response = await self.request(game, {
+                    "cmd": "reveal", "session": session, "args": args})
+                over = response["status"] != 0
+            elif game == "mastermind":
+                guess = "".join(str(rng.randint(1, info["cmp"]))
+                                for _ in range(0, info["ln"]))
+                response = await self.request(game, {
+                    "cmd": "guess", "session": session, "args": [guess]})
+                over = response["won"]
+            else:
+                state = info["state"]
+                square = rng.choice([s for s in range(0, 9) if state[s] == 0])
+                info = await self.request(game, {
+                    "cmd": "move", "session": session, "args": [square]})
+                over = info["over"]
+            if over:
+                session, info = await self.new(game)
+
+
+async def connection(host, port, games, moves, latencies, seed):
+    """Play a list of games over one connection."""
+    reader, writer = await asyncio.open_connection(host, port,
+                                                   limit=2 ** 24)
+    client = Client(reader, writer, latencies)
+    rng = random.Random(seed)
+    for game in games:
+        await client.play(game, moves, rng)
+    writer.close()
+    await writer.wait_closed()
+
+
+def report(latencies, elapsed):
+    """Print request counts and p50/p99 latency per game and command."""
+    total = sum(len(times) for times in latencies.values())
+    print(f"{total} requests in {elapsed:.2f} s ({total / elapsed:.0f}/s)")
+    print(f"{'game':<12} {'cmd':<7} {'count':>7} {'p50 ms':>8} "
+          f"{'p99 ms':>8}")
+    rows = sorted(latencies.items())
+    rows.append((("all", ""), [t for _, times in rows for t in times]))
+    for (game, cmd), times in rows:
+        p50, p99 = np.percentile(times, [50, 99]) * 1000
+        print(f"{game:<12} {cmd:<7} {len(times):>7} {p50:>8.3f} {p99:>8.3f}")
+
+
+async def load_test(host="127.0.0.1", port=PORT, sessions=1000,
+                    connections=50, moves=10, seed=0, spawn=False):
+    """Run the load test, returning the latencies and elapsed seconds."""
+    server = None
+    if spawn:
+        ready = asyncio.Event()
+        server = asyncio.create_task(Server().serve(host, port, ready))
+        await ready.wait()
+    games = [list(NEW_ARGS)[k % len(NEW_ARGS)] for k in range(0, sessions)]
+    latencies = {}
+    start = time.perf_counter()
+    await asyncio.gather(*[
+        connection(host, port, games[k::connections], moves, latencies,
+                   seed + k) for k in range(0, connections)])
+    elapsed = time.perf_counter() - start
+    if server is not None:
+        server.cancel()
+        try:
+            await server
+        except asyncio.CancelledError:
+            pass
+    return latencies, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--connections", type=int, default=50)
+    parser.add_argument("--moves", type=int, default=10,
+                        help="moves per session")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--spawn", action="store_true",
+                        help="start a server in this process")
+    args = parser.parse_args()
+    latencies, elapsed = asyncio.run(load_test(
+        args.host, args.port, args.sessions, args.connections, args.moves,
+        args.seed, args.spawn))
+    report(latencies, elapsed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""Ordered process pool map shared by the batch generators."""
+from concurrent.futures import ProcessPoolExecutor
+import os
+
+
+def ordered_map(fn, jobs, processes=None, window=None):
+    """Yield fn(job) for each job of an iterable, in order.
+
+    With processes above one (default the cpu count) jobs run in a process
+    pool, with at most window (default four per process) in flight, so an
+    endless job stream is fine. fn must be picklable, e.g. a module level
+    function. Closing the generator early cancels the jobs not yet started
+    and returns without waiting for those running.
+    """
+    if processes is None:
+        processes = os.cpu_count() or 1
+    if processes <= 1:
+        for job in jobs:
+            yield fn(job)
+        return
+    if window is None:
+        window = 4 * processes
+    pool = ProcessPoolExecutor(processes)
+    pending = []
+    try:
+        for job in jobs:
+            pending.append(pool.submit(fn, job))
+            if len(pending) >= window:
+                yield pending.pop(0).result()
+        while pending:
+            yield pending.pop(0).result()
+    finally:
+        pool.shutdown(wait=not pending, cancel_futures=True)
@@ -0,0 +1,341 @@
+"""Asyncio server hosting many minesweeper, mastermind and tictactoe games.
+
+The protocol is one JSON object per line each way. A request names a
+command and, except for "new", the session it applies to:
+
+    {"cmd": "new", "game": "minesweeper", "args": {"m": 16, "n": 30,
+                                                   "mines": 99}}
+    {"cmd": "reveal", "session": "3f2a...", "args": [0, 0]}
+
+Every response has "ok", plus "error" when it is false. Sessions live in
+memory using the headless game cores, are locked while a command runs and
+are evicted after idle seconds without a command. Board generation and
+solver hints run in a process pool so they never block the event loop.
+
+    python -m games.server [--host HOST] [--port PORT] [--idle SECONDS]
+"""
+import argparse
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+import json
+import logging
+import secrets
+import time
+
+from mastermind.mastermind import check, generate_code
+from mastermind.simulate import consistent_chunks
+from mastermind.solver import Solver
+from minesweeper.board import create_reference
+from minesweeper.solver import solve
+from minesweeper.state import Board
+from tictactoe.engine import best_move, load, winner
+
+PORT = 8765
+log = logging.getLogger(__name__)
+# boards with fewer cells are generated on the event loop, as a round trip
+# to the process pool costs more than the generation
+INLINE_CELLS = 10000
+# largest mastermind code space given solver hints, its feedback table
+# takes this many squared bytes
+TABLE_CODES = 4096
+
+
+def _mastermind_hint(cmp, ln, history):
+    """Process pool entry point: next guess after (guess, result) pairs.
+
+    Small games use the solver, whose feedback table and decision tree are
+    cached in each worker. The table grows with the square of the number
+    of codes, so larger games suggest the first code consistent with the
+    history, found a chunk of codes at a time.
+    """
+    if cmp ** ln <= TABLE_CODES:
+        solver = Solver(cmp, ln)
+        for guess, result in history:
+            solver.update(guess, result)
+        return solver.guess()
+    counts = [(guess, result.count("G"), result.count("Y"))
+              for guess, result in history]
+    indices, codes = next(consistent_chunks(counts, cmp, ln))
+    return codes[0].tolist()
+
+
+def _minesweeper_hint(view, mines):
+    """Process pool entry point: safe and mine cells of a player view."""
+    safe, known, probs = solve(view, mines)
+    return sorted(safe), sorted(known)
+
+
+class Session():
+    """One game: its state, a lock and the time it was last used."""
+
+    __slots__ = ("id", "lock", "last_used")
+
+    def __init__(self):
+        self.id = secrets.token_hex(8)
+        self.lock = asyncio.Lock()
+        self.last_used = time.monotonic()
+
+    async def command(self, server, cmd, args):
+        """Run a command, returning the response fields."""
+        method = getattr(self, f"cmd_{cmd}", None)
+        if method is None:
+            raise ValueError(f"Unknown command {cmd!r}")
+        return await method(server, *args)
+
+
+class MinesweeperSession(Session):
+    """Minesweeper game on a headless Board."""
+
+    __slots__ = ("board",)
+
+    @classmethod
+    async def create(cls, server, m=9, n=9, mines=10):
+        if not (0 < m <= 1000 and 0 < n <= 1000 and 0 <= mines < m * n):
+            raise ValueError(
+                "Board must be up to 1000 x 1000 with a free cell")
+        session = cls()
+        if m * n < INLINE_CELLS:
+            session.board = Board.create(m, n, mines)
+        else:
+            session.board = Board(await server.run(create_reference, m, n,
+                                                   mines))
+        return session
+
+    def info(self):
+        return {"m": self.board.m, "n": self.board.n,
+                "mines": self.board.mines}
+
+    def moved(self, changed):
+        board = self.board
+        return {"changed": [[i, j, int(board.cell(i, j))] for i, j in changed],
+                "status": board.status}
+
+    async def cmd_reveal(self, server, i, j):
+        return self.moved(self.board.reveal(i, j))
+
+    async def cmd_flag(self, server, i, j):
+        return self.moved(self.board.flag(i, j))
+
+    async def cmd_chord(self, server, i, j):
+        return self.moved(self.board.chord(i, j))
+
+    async def cmd_view(self, server):
+        return {"view": self.board.view().tolist(),
+                "status": self.board.status}
+
+    async def cmd_hint(self, server):
+        safe, known = await server.run(_minesweeper_hint, self.board.view(),
+                                       self.board.mines)
+        return {"safe": safe, "mines": known}
+
+
+class MastermindSession(Session):
+    """Mastermind game against a random answer."""
+
+    __slots__ = ("cmp", "ln", "answer", "history", "won")
+
+    @classmethod
+    async def create(cls, server, cmp=6, ln=4):
+        if not (1 < cmp < 10 and 0 < ln <= 8):
+            raise ValueError("Use 2 to 9 colours and 1 to 8 pegs")
+        session = cls()
+        session.cmp = cmp
+        session.ln = ln
+        session.answer = generate_code(cmp, ln)
+        session.history = []
+        session.won = False
+        return session
+
+    def info(self):
+        return {"cmp": self.cmp, "ln": self.ln}
+
+    async def cmd_guess(self, server, guess):
+        guess = [int(c) for c in str(guess)]
+        if len(guess) != self.ln or not all(1 <= c <= self.cmp for c in guess):
+            raise ValueError(
+                f"Guess {self.ln} numbers between 1 and {self.cmp}")
+        result = check(guess, self.answer, self.ln)
+        self.history.append((guess, result))
+        self.won = result == ["G" for i in range(0, self.ln)]
+        return {"result": "".join(result), "won": self.won,
+                "guesses": len(self.history)}
+
+    async def cmd_hint(self, server):
+        if self.won:
+            raise ValueError("Game is over")
+        guess = await server.run(_mastermind_hint, self.cmp, self.ln,
+                                 self.history)
+        return {"guess": "".join(str(c) for c in guess)}
+
+
+class TictactoeSession(Session):
+    """Tic tac toe game, optionally against the engine."""
+
+    __slots__ = ("state", "computer")
+
+    @classmethod
+    async def create(cls, server, computer=-1):
+        if computer not in (None, 1, -1):
+            raise ValueError("computer must be 1, -1 or null")
+        session = cls()
+        session.state = [0] * 9
+        session.computer = computer
+        if computer == 1:
+            session.state[best_move(session.state)] = 1
+        return session
+
+    def info(self):
+        return {"computer": self.computer, "state": self.state}
+
+    def over(self):
+        return winner(self.state) != 0 or 0 not in self.state
+
+    async def cmd_move(self, server, square):
+        state = self.state
+        if self.over():
+            raise ValueError("Game is over")
+        if not 0 <= square < 9 or state[square] != 0:
+            raise ValueError("Square is taken or off the board")
+        state[square] = 1 if state.count(1) == state.count(-1) else -1
+        reply = None
+        if self.computer is not None and not self.over():
+            reply = best_move(state)
+            state[reply] = self.computer
+        return {"state": state, "reply": reply, "winner": winner(state),
+                "over": self.over()}
+
+    async def cmd_hint(self, server):
+        if self.over():
+            raise ValueError("Game is over")
+        return {"square": best_move(self.state)}
+
+
+GAMES = {"minesweeper": MinesweeperSession,
+         "mastermind": MastermindSession,
+         "tictactoe": TictactoeSession}
+
+
+class Server():
+    """Session table, process pool and connection handler."""
+
+    def __init__(self, idle=300.0, processes=None):
+        self.idle = idle
+        self.processes = processes
+        self.sessions = {}
+        self.evicted = 0
+        self.executor = None
+
+    async def run(self, fn, *args):
+        """Run fn(*args) in the process pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, fn, *args)
+
+    async def dispatch(self, request):
+        """Handle one request, returning the response."""
+        if not isinstance(request, dict):
+            return {"ok": False, "error": "Request must be a JSON object"}
+        cmd = request.get("cmd")
+        try:
+            if cmd == "new":
+                cls = GAMES.get(request.get("game"))
+                if cls is None:
+                    raise ValueError(f"Games are {', '.join(GAMES)}")
+                args = request.get("args", {})
+                if not isinstance(args, dict):
+                    raise ValueError("new takes an object of arguments")
+                session = await cls.create(self, **args)
+                self.sessions[session.id] = session
+                return {"ok": True, "session": session.id, **session.info()}
+            if cmd == "stats":
+                return {"ok": True, "sessions": len(self.sessions),
+                        "evicted": self.evicted}
+            session = self.sessions.get(request.get("session"))
+            if session is None:
+                raise ValueError("Unknown or expired session")
+            if cmd == "close":
+                del self.sessions[session.id]
+                return {"ok": True}
+            args = request.get("args", [])
+            if not isinstance(args, list):
+                raise ValueError(f"{cmd} takes a list of arguments")
+            async with session.lock:
+                session.last_used = time.monotonic()
+                result = await session.command(self, cmd, args)
+                session.last_used = time.monotonic()
+            return {"ok": True, **result}
+        except (ValueError, TypeError, IndexError) as error:
+            return {"ok": False, "error": str(error)}
+        except Exception:
+            # a bug or a failed worker must not drop the connection
+            log.exception("Request %r failed", request)
+            return {"ok": False, "error": "Internal error"}
+
+    async def handle(self, reader, writer):
+        """Serve requests from one connection until it closes."""
+        try:
+            while line := await reader.readline():
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    response = {"ok": False, "error": "Invalid JSON"}
+                else:
+                    response = await self.dispatch(request)
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def evict(self):
+        """Drop sessions idle for longer than self.idle, returning how many."""
+        cutoff = time.monotonic() - self.idle
+        stale = [k for k, session in self.sessions.items()
+                 if session.last_used < cutoff and not session.lock.locked()]
+        for k in stale:
+            del self.sessions[k]
+        self.evicted += len(stale)
+        return len(stale)
+
+    async def evict_loop(self):
+        """Evict idle sessions every quarter of the idle time."""
+        while True:
+            await asyncio.sleep(self.idle / 4)
+            self.evict()
+
+    async def serve(self, host="127.0.0.1", port=PORT, ready=None):
+        """Listen until cancelled. ready is an optional asyncio.Event."""
+        self.executor = ProcessPoolExecutor(self.processes)
+        # build or load the tictactoe tables before the first move
+        load()
+        server = await asyncio.start_server(self.handle, host, port)
+        evictor = asyncio.create_task(self.evict_loop())
+        if ready is not None:
+            ready.set()
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            evictor.cancel()
+            self.executor.shutdown(cancel_futures=True)
+            self.executor = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--idle", type=float, default=300.0,
+                        help="seconds before an unused session is evicted")
+    parser.add_argument("--processes", type=int, default=None,
+                        help="worker processes for generation and hints")
+    args = parser.parse_args()
+    try:
+        asyncio.run(Server(args.idle, args.processes).serve(args.host,
+                                                           args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
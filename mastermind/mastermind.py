@@ -1,6 +1,8 @@
 """Module to run mastermind."""
 from random import randint
 
+from games.instrument import timed
+
 
 def generate_code(cmp=6, ln=4):
     """Generate a random answer code."""
@@ -24,6 +26,51 @@ def check(guess, answer, ln=4):
     return result
 
 
+def colour_counts(codes, size):
+    """Count each colour below size in every code along the last axis."""
+    import numpy as np
+    flat = codes.reshape(-1, codes.shape[-1]).astype(np.intp)
+    # offset each code into its own block of size bins
+    flat = flat + np.arange(len(flat))[:, None] * size
+    counts = np.bincount(flat.ravel(), minlength=len(flat) * size)
+    return counts.reshape(codes.shape[:-1] + (size,))
+
+
+def check_many(guesses, answers, positional=False):
+    """Score rows of guesses against rows of answers all at once.
+
+    guesses and answers are arrays of codes with the code along the last
+    axis that broadcast together, e.g. (N, ln) against (N, ln) for pairs,
+    or (N, 1, ln) against (1, M, ln) for every combination. Returns the
+    green and yellow counts, and with positional also the G,Y,_ array
+    matching check for every pair.
+    """
+    # numpy is imported here so the interactive game starts without it
+    import numpy as np
+    guesses = np.asarray(guesses)
+    answers = np.asarray(answers)
+    green = guesses == answers
+    greens = np.count_nonzero(green, axis=-1)
+    # pegs in common: sum over colours of the smaller count
+    size = int(max(guesses.max(), answers.max())) + 1
+    common = np.minimum(colour_counts(guesses, size),
+                        colour_counts(answers, size)).sum(axis=-1)
+    yellows = common - greens
+    if not positional:
+        return greens, yellows
+    # yellow where earlier non green guesses of the same colour have not
+    # used up that colour in the non green answer pegs
+    green, guesses, answers = np.broadcast_arrays(green, guesses, answers)
+    yellow = np.zeros(green.shape, dtype=bool)
+    for i in range(0, guesses.shape[-1]):
+        peg = guesses[..., i:i + 1]
+        available = np.sum((answers == peg) & ~green, axis=-1)
+        used = np.sum((guesses[..., :i] == peg) & ~green[..., :i], axis=-1)
+        yellow[..., i] = ~green[..., i] & (used < available)
+    result = np.where(green, "G", np.where(yellow, "Y", "_"))
+    return greens, yellows, result
+
+
 def user_guess_recursive(cmp=6, ln=4):
     """Recursive implementation to validate user guesses."""
     str = input(f"Guess {ln} numbers between 1 and {cmp}\n")
@@ -55,14 +102,19 @@ def user_guess(cmp=6, ln=4):
     return guess
 
 
-def game(cmp=6, ln=4):
-    """Code to play a mastermind game: accepting inputs and responding."""
+def game(cmp=6, ln=4, stats=None):
+    """Code to play a mastermind game: accepting inputs and responding.
+
+    stats is an optional games.instrument.Stats to record timings in.
+    """
     answer = generate_code(cmp, ln)
     play = True
 
     while play:
-        guess = user_guess(cmp, ln)
-        result = check(guess, answer, ln)
+        guess = timed(stats, "input", user_guess, cmp, ln)
+        result = timed(stats, "check", check, guess, answer, ln)
+        if stats is not None:
+            stats.move()
         if result == ["G" for i in range(0, ln)]:
             print("You win!")
             play = False
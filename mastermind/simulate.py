@@ -0,0 +1,145 @@
+"""Headless self-play simulation of mastermind strategies."""
+import json
+import time
+
+import numpy as np
+
+from games.pool import ordered_map
+from mastermind.mastermind import check, check_many
+from mastermind.solver import Solver
+
+# codes decoded and filtered at a time by the lazy strategies
+CHUNK = 2 ** 16
+# strategies needing the full feedback table, only for small code spaces
+TABLE_STRATEGIES = ("minimax", "expected")
+STRATEGIES = TABLE_STRATEGIES + ("first", "random")
+# largest code space for the table strategies, whose table is its square
+# in bytes (64 MiB here)
+TABLE_CODES = 2 ** 13
+
+
+def check_strategy(strategy, cmp=6, ln=4):
+    """Raise ValueError if strategy is unknown or too big for the game."""
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown strategy {strategy}")
+    if strategy in TABLE_STRATEGIES and cmp ** ln > TABLE_CODES:
+        raise ValueError(f"{strategy} needs at most {TABLE_CODES} codes, "
+                         f"not {cmp ** ln}")
+
+
+def codes_between(start, stop, cmp=6, ln=4):
+    """Codes with indices start to stop as a (stop - start, ln) array."""
+    index = np.arange(start, stop, dtype=np.int64)
+    powers = cmp ** np.arange(ln - 1, -1, -1, dtype=np.int64)
+    return (index[:, None] // powers % cmp + 1).astype(np.int8)
+
+
+def consistent_chunks(history, cmp=6, ln=4, start=0, chunk=CHUNK):
+    """Yield (indices, codes) for chunks of codes consistent with history.
+
+    history is a list of (guess, greens, yellows). Codes are decoded and
+    filtered a chunk at a time so the code space is never held in memory.
+    """
+    total = cmp ** ln
+    for begin in range(start, total, chunk):
+        codes = codes_between(begin, min(begin + chunk, total), cmp, ln)
+        keep = np.ones(len(codes), dtype=bool)
+        for guess, greens, yellows in history:
+            g, y = check_many(np.asarray(guess)[None, :], codes[keep])
+            survivors = (g == greens) & (y == yellows)
+            keep[np.flatnonzero(keep)[~survivors]] = False
+            if not keep.any():
+                break
+        indices = np.flatnonzero(keep)
+        if len(indices):
+            yield begin + indices, codes[indices]
+
+
+def play(answer, cmp=6, ln=4, strategy="minimax", rng=None):
+    """Play one game against answer.
+
+    Returns the number of guesses and the time in seconds of each decision.
+    """
+    check_strategy(strategy, cmp, ln)
+    rng = np.random.default_rng(rng)
+    solver = Solver(cmp, ln, strategy) if strategy in TABLE_STRATEGIES \
+        else None
+    history = []
+    start = 0
+    times = []
+    while True:
+        begin = time.perf_counter()
+        if solver is not None:
+            guess = solver.guess()
+        elif strategy == "first":
+            # the first consistent code can only move forward as the
+            # history grows, so each game scans the code space once
+            indices, codes = next(consistent_chunks(history, cmp, ln, start))
+            start = int(indices[0]) + 1
+            guess = codes[0].tolist()
+        elif strategy == "random":
+            # reservoir sample a uniformly random consistent code
+            seen = 0
+            for indices, codes in consistent_chunks(history, cmp, ln):
+                seen += len(codes)
+                if rng.random() < len(codes) / seen:
+                    guess = codes[rng.integers(len(codes))].tolist()
+        times.append(time.perf_counter() - begin)
+        result = check(guess, answer, ln)
+        if result == ["G" for i in range(0, ln)]:
+            return len(times), times
+        if solver is not None:
+            solver.update(guess, result)
+        history.append((guess, result.count("G"), result.count("Y")))
+
+
+def _play_worker(args):
+    """Process pool entry point: play one seeded game to a result record."""
+    strategy, cmp, ln, game, seed = args
+    rng = np.random.default_rng(seed)
+    answer = rng.integers(1, cmp + 1, ln).tolist()
+    guesses, times = play(answer, cmp, ln, strategy, rng)
+    return {"strategy": strategy, "cmp": cmp, "ln": ln, "game": game,
+            "answer": "".join(str(c) for c in answer), "guesses": guesses,
+            "decision_times": times}
+
+
+def simulate(strategies=("minimax",), games=100, cmp=6, ln=4, seed=None,
+             processes=None):
+    """Yield a result record for each game played by each strategy.
+
+    Each game's answer comes from its own child seed of seed, so every
+    strategy faces the same answers. With processes above one, games are
+    spread over a process pool and records stream back in order.
+    """
+    for strategy in strategies:
+        check_strategy(strategy, cmp, ln)
+    root = np.random.SeedSequence(seed)
+    seeds = root.spawn(games)
+    jobs = ((strategy, cmp, ln, game, seeds[game])
+            for strategy in strategies for game in range(0, games))
+    yield from ordered_map(_play_worker, jobs, processes)
+
+
+def write_jsonl(results, f):
+    """Write result records to an open file, one JSON object per line."""
+    for record in results:
+        f.write(json.dumps(record) + "\n")
+        f.flush()
+
+
+def summarise(results):
+    """Mean and max guesses and mean decision time for each strategy."""
+    stats = {}
+    for record in results:
+        s = stats.setdefault(record["strategy"],
+                             {"games": 0, "guesses": 0, "max": 0, "time": 0.0})
+        s["games"] += 1
+        s["guesses"] += record["guesses"]
+        s["max"] = max(s["max"], record["guesses"])
+        s["time"] += sum(record["decision_times"])
+    return {strategy: {"games": s["games"],
+                       "mean_guesses": s["guesses"] / s["games"],
+                       "max_guesses": s["max"],
+                       "mean_decision_time": s["time"] / s["guesses"]}
+            for strategy, s in stats.items()}
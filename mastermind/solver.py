@@ -0,0 +1,139 @@
+"""Solve mastermind with a precomputed feedback table."""
+import numpy as np
+
+from mastermind.mastermind import check, check_many
+
+# feedback tables and decision trees, cached per game size
+_tables = {}
+_trees = {}
+
+
+def all_codes(cmp=6, ln=4):
+    """Every code as a (cmp ** ln, ln) array, row k being the code of k."""
+    digits = np.indices((cmp,) * ln).reshape(ln, -1).T
+    return (digits + 1).astype(np.int8)
+
+
+def encode(code, cmp=6):
+    """Integer index of a code of numbers between 1 and cmp."""
+    index = 0
+    for c in code:
+        index = index * cmp + (c - 1)
+    return index
+
+
+def decode(index, cmp=6, ln=4):
+    """Code with the given integer index."""
+    code = []
+    for i in range(0, ln):
+        index, c = divmod(index, cmp)
+        code.append(c + 1)
+    return code[::-1]
+
+
+def feedback(greens, yellows, ln=4):
+    """Pack green and yellow counts into one byte."""
+    return greens * (ln + 1) + yellows
+
+
+def unpack(byte, ln=4):
+    """Green and yellow counts of a packed feedback byte."""
+    return divmod(int(byte), ln + 1)
+
+
+def feedback_table(cmp=6, ln=4):
+    """Packed feedback of every guess (row) against every answer (col)."""
+    key = (cmp, ln)
+    if key not in _tables:
+        codes = all_codes(cmp, ln)
+        size = len(codes)
+        table = np.empty((size, size), dtype=np.uint8)
+        # fill a block of rows at a time to bound memory
+        step = max(1, 2 ** 22 // (size * ln))
+        for start in range(0, size, step):
+            block = codes[start:start + step, None, :]
+            greens, yellows = check_many(block, codes[None, :, :])
+            table[start:start + step] = feedback(greens, yellows, ln)
+        _tables[key] = table
+    return _tables[key]
+
+
+def partition_sizes(table, candidates, ln=4):
+    """Size of each feedback class for every guess over the candidates."""
+    classes = (ln + 1) ** 2
+    rows = table[:, candidates].astype(np.int64)
+    rows += np.arange(len(table))[:, None] * classes
+    return np.bincount(rows.ravel(),
+                       minlength=len(table) * classes).reshape(-1, classes)
+
+
+def choose(table, candidates, strategy="minimax", ln=4):
+    """Pick the next guess index for the remaining candidates.
+
+    minimax (Knuth) minimises the largest partition, expected minimises the
+    expected partition size. Ties prefer guesses that could be the answer,
+    then the lowest index.
+    """
+    if len(candidates) <= 2:
+        return int(candidates[0])
+    sizes = partition_sizes(table, candidates, ln)
+    if strategy == "minimax":
+        cost = sizes.max(axis=1).astype(np.float64)
+    elif strategy == "expected":
+        cost = (sizes.astype(np.float64) ** 2).sum(axis=1) / len(candidates)
+    else:
+        raise ValueError(f"Unknown strategy {strategy}")
+    best = np.flatnonzero(cost == cost.min())
+    possible = best[np.isin(best, candidates)]
+    return int(possible[0] if len(possible) else best[0])
+
+
+class Solver():
+    """Track the remaining candidates and suggest guesses."""
+
+    def __init__(self, cmp=6, ln=4, strategy="minimax"):
+        self.cmp = cmp
+        self.ln = ln
+        self.strategy = strategy
+        self.table = feedback_table(cmp, ln)
+        self.candidates = np.arange(len(self.table))
+        # decisions are shared by every game of the same size and strategy
+        self.tree = _trees.setdefault((cmp, ln, strategy), {})
+        self.path = ()
+
+    def guess(self):
+        """Next guess as a list of numbers."""
+        if self.path not in self.tree:
+            self.tree[self.path] = choose(self.table, self.candidates,
+                                          self.strategy, self.ln)
+        return decode(self.tree[self.path], self.cmp, self.ln)
+
+    def update(self, guess, result):
+        """Keep the candidates consistent with a check result."""
+        byte = feedback(result.count("G"), result.count("Y"), self.ln)
+        index = encode(guess, self.cmp)
+        self.candidates = self.candidates[
+            self.table[index, self.candidates] == byte]
+        self.path = self.path + ((index, byte),)
+
+
+def solve(answer, cmp=6, ln=4, strategy="minimax"):
+    """Play against a known answer, returning the list of guesses."""
+    solver = Solver(cmp, ln, strategy)
+    guesses = []
+    while True:
+        guess = solver.guess()
+        guesses.append(guess)
+        result = check(guess, answer, ln)
+        if result == ["G" for i in range(0, ln)]:
+            return guesses
+        solver.update(guess, result)
+
+
+def build_tree(cmp=6, ln=4, strategy="minimax"):
+    """Precompute the decision tree by solving every answer.
+
+    Returns the number of guesses needed for each answer index.
+    """
+    return np.array([len(solve(decode(k, cmp, ln), cmp, ln, strategy))
+                     for k in range(0, cmp ** ln)])
@@ -0,0 +1,178 @@
+"""Difficulty statistics over large samples of generated boards.
+
+Metrics are computed for a whole (batch, m, n) stack of reference grids
+at once. Batches are generated and measured in a process pool, and their
+histograms merged and yielded as they arrive.
+"""
+import numpy as np
+
+from games.pool import ordered_map
+from minesweeper.board import create_references, neighbour_counts
+from minesweeper.generate import solvable
+
+# per board metrics collected by analyse
+METRICS = ("3bv", "openings", "largest_opening")
+
+
+def label_openings(ref_stack):
+    """Label the 8-connected zero regions of a stack of reference grids.
+
+    Returns an array of the stack's shape holding, for each zero cell, the
+    flat index (into the stack) of the first cell of its region, and -1
+    elsewhere. Labels are found by repeatedly hooking each region onto its
+    smallest neighbouring label and then pointer jumping, so the number of
+    passes grows with the log of a region's size rather than its width.
+    """
+    ref_stack = np.asarray(ref_stack)
+    batch, m, n = ref_stack.shape
+    # pad every board so regions never join across boards
+    zero = np.zeros((batch, m + 2, n + 2), dtype=bool)
+    zero[:, 1:-1, 1:-1] = ref_stack == 0
+    size = zero.size
+    cells = np.flatnonzero(zero)
+    labels = np.full(size + 1, size, dtype=np.int64)
+    labels[cells] = cells
+    width = n + 2
+    around = [cells + o for o in (-width - 1, -width, -width + 1, -1, 1,
+                                  width - 1, width, width + 1)]
+    # non zero cells and the padding keep the label size, larger than any
+    while True:
+        old = labels[cells]
+        smallest = old.copy()
+        for nb in around:
+            np.minimum(smallest, labels[nb], out=smallest)
+        # hook each current root onto the smallest label next to its cells
+        np.minimum.at(labels, old, smallest)
+        # pointer jumping until every cell points at a root
+        while True:
+            parent = labels[cells]
+            grand = labels[parent]
+            if np.array_equal(parent, grand):
+                break
+            labels[cells] = grand
+        if np.array_equal(labels[cells], old):
+            break
+    # map labels back from the padded stack to the unpadded one
+    b, r, c = np.unravel_index(labels[cells], zero.shape)
+    result = np.full(zero.shape, -1, dtype=np.int64)
+    result.ravel()[cells] = np.ravel_multi_index((b, r - 1, c - 1),
+                                                 ref_stack.shape)
+    return result[:, 1:-1, 1:-1]
+
+
+def metrics(ref_stack):
+    """Per board 3BV, number of openings and largest opening of a stack.
+
+    3BV, the fewest clicks that clear a board, is the number of openings
+    plus the safe numbered cells not bordering any opening. An opening's
+    size counts its zero cells.
+    """
+    ref_stack = np.asarray(ref_stack)
+    batch = len(ref_stack)
+    labels = label_openings(ref_stack).reshape(batch, -1)
+    roots = labels == np.arange(labels.size).reshape(labels.shape)
+    openings = np.count_nonzero(roots, axis=1)
+    # zero cells per region, then the largest region of each board
+    zeros = labels[labels >= 0]
+    sizes = np.bincount(zeros, minlength=labels.size)
+    largest = np.zeros(batch, dtype=np.int64)
+    region_boards = np.flatnonzero(roots.ravel())
+    np.maximum.at(largest, region_boards // labels.shape[1],
+                  sizes[region_boards])
+    # numbers revealed by no opening need a click each
+    near_zero = neighbour_counts(ref_stack == 0) > 0
+    isolated = np.count_nonzero((ref_stack > 0) & ~near_zero, axis=(1, 2))
+    return {"3bv": openings + isolated, "openings": openings,
+            "largest_opening": largest}
+
+
+class Histograms():
+    """Counts of each metric value over all boards seen."""
+
+    def __init__(self):
+        self.boards = 0
+        self.solvable = 0
+        # metric name to int64 array, entry v counting boards with value v
+        self.counts = {name: np.zeros(0, dtype=np.int64) for name in METRICS}
+
+    def add(self, values, solvable=0):
+        """Add per board metric values (or another Histograms)."""
+        if isinstance(values, Histograms):
+            self.boards += values.boards
+            self.solvable += values.solvable
+            for name, counts in values.counts.items():
+                self._merge(name, counts)
+            return
+        self.boards += len(values[METRICS[0]])
+        self.solvable += solvable
+        for name in METRICS:
+            self._merge(name, np.bincount(values[name]))
+
+    def copy(self):
+        """Independent copy of these histograms."""
+        result = Histograms()
+        result.add(self)
+        return result
+
+    def _merge(self, name, counts):
+        total = self.counts[name]
+        if len(counts) > len(total):
+            total = np.pad(total, (0, len(counts) - len(total)))
+        total[:len(counts)] += counts
+        self.counts[name] = total
+
+    def mean(self, name):
+        counts = self.counts[name]
+        return float(counts @ np.arange(len(counts))) / max(self.boards, 1)
+
+    def percentile(self, name, q):
+        """Smallest value with at least q percent of boards at or below."""
+        cumulative = np.cumsum(self.counts[name])
+        return int(np.searchsorted(cumulative, q / 100 * self.boards))
+
+    def summary(self):
+        """Boards, no guess fraction and mean/p50/p99/max of each metric."""
+        result = {"boards": self.boards,
+                  "no_guess": self.solvable / max(self.boards, 1)}
+        for name, counts in self.counts.items():
+            result[name] = {"mean": self.mean(name),
+                            "p50": self.percentile(name, 50),
+                            "p99": self.percentile(name, 99),
+                            "max": int(np.flatnonzero(counts)[-1])
+                            if counts.any() else 0}
+        return result
+
+
+def _analyse_worker(args):
+    """Process pool entry point: histograms of one batch of boards."""
+    m, n, mines, size, start, opening, solve, seed = args
+    ref_stack = create_references(size, m, n, mines, seed, start, opening)
+    histograms = Histograms()
+    solved = 0
+    if solve:
+        solved = sum(solvable(ref_grid, start) for ref_grid in ref_stack)
+    histograms.add(metrics(ref_stack), solved)
+    return histograms
+
+
+def analyse(m, n, mines, count, batch=1000, start=None, opening=True,
+            solve=False, seed=None, processes=None):
+    """Yield the merged Histograms after each batch of count boards.
+
+    The first click is at start (default the centre), kept safe, and with
+    opening a zero. With solve the solver also plays every board to count
+    those it finishes without guessing, which is far slower than the
+    metrics. Batches come from child seeds of seed in order, so results do
+    not depend on the number of processes. Each yield is a separate copy,
+    so earlier ones keep their totals.
+    """
+    if start is None:
+        start = (m // 2, n // 2)
+    root = np.random.SeedSequence(seed)
+    sizes = [min(batch, count - k) for k in range(0, count, batch)]
+    jobs = ((m, n, mines, size, start, opening, solve, child)
+            for size, child in zip(sizes, root.spawn(len(sizes))))
+    total = Histograms()
+    for histograms in ordered_map(_analyse_worker, jobs, processes):
+        total.add(histograms)
+        yield total.copy()
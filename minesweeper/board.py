@@ -0,0 +1,88 @@
+"""Board generation for minesweeper."""
+import numpy as np
+
+
+def neighbour_counts(mine_grid):
+    """Count surrounding mines for every cell of a grid (or stack of grids)."""
+    mine_grid = np.asarray(mine_grid, dtype=np.int8)
+    m, n = mine_grid.shape[-2:]
+    # zero border on the last two axes to avoid indexing issues
+    pad = [(0, 0)] * (mine_grid.ndim - 2) + [(1, 1), (1, 1)]
+    padded = np.pad(mine_grid, pad)
+    # sum the eight shifted copies of the grid
+    counts = np.zeros(mine_grid.shape, dtype=np.int8)
+    for di in range(0, 3):
+        for dj in range(0, 3):
+            if di == 1 and dj == 1:
+                continue
+            counts += padded[..., di:di + m, dj:dj + n]
+    return counts
+
+
+def place_mines(m, n, mines, rng=None, exclude=None):
+    """Return an m x n boolean grid with mines placed at random.
+
+    exclude is an optional list of (row, col) cells kept free of mines.
+    """
+    rng = np.random.default_rng(rng)
+    mine_grid = np.zeros(m * n, dtype=bool)
+    if exclude:
+        allowed = np.ones(m * n, dtype=bool)
+        allowed[[i * n + j for i, j in exclude]] = False
+        cells = np.flatnonzero(allowed)
+    else:
+        cells = m * n
+    # sample mine indices directly rather than shuffling the whole board
+    mine_grid[rng.choice(cells, size=mines, replace=False)] = True
+    return mine_grid.reshape((m, n))
+
+
+def reference_from_mines(mine_grid):
+    """Create a grid of counts with mines marked as -1."""
+    ref_grid = neighbour_counts(mine_grid)
+    ref_grid[np.asarray(mine_grid, dtype=bool)] = -1
+    return ref_grid
+
+
+def create_reference(m, n, mines, rng=None, safe=None, opening=False):
+    """Create a grid containing mines and counts.
+
+    rng may be a seed or a numpy.random.Generator for reproducible boards.
+    If safe is a (row, col) cell it is kept free of mines, and with opening
+    its neighbours are too so the first click there reveals a zero.
+    """
+    exclude = safe_cells(m, n, safe, opening)
+    return reference_from_mines(place_mines(m, n, mines, rng, exclude))
+
+
+def safe_cells(m, n, safe=None, opening=False):
+    """Cells kept free of mines by create_reference, or None."""
+    if safe is None:
+        return None
+    i, j = safe
+    if opening:
+        return [(r, c)
+                for r in range(max(i - 1, 0), min(i + 2, m))
+                for c in range(max(j - 1, 0), min(j + 2, n))]
+    return [(i, j)]
+
+
+def create_references(count, m, n, mines, rng=None, safe=None,
+                      opening=False):
+    """Create a (count, m, n) stack of reference grids at once.
+
+    Options are as for create_reference, though the boards drawn from a
+    seed differ. Each board takes the mines cells with the smallest random
+    keys, so every placement is equally likely.
+    """
+    rng = np.random.default_rng(rng)
+    keys = rng.random((count, m * n))
+    exclude = safe_cells(m, n, safe, opening)
+    if exclude:
+        # excluded cells are never among the smallest keys
+        keys[:, [i * n + j for i, j in exclude]] = 2.0
+    mine_grid = np.zeros((count, m * n), dtype=bool)
+    if mines:
+        chosen = np.argpartition(keys, mines - 1, axis=1)[:, :mines]
+        np.put_along_axis(mine_grid, chosen, True, axis=1)
+    return reference_from_mines(mine_grid.reshape((count, m, n)))
@@ -0,0 +1,152 @@
+"""Compact files of many minesweeper boards of one size.
+
+A file is MAGIC and a HEADER with the board size, followed by fixed size
+records of the board's seed (0 if unknown), mine count and mines packed
+eight cells to a byte. Counts are rebuilt on load, so an expert board
+takes 72 bytes. Records are read through a memory map, so board k is found
+without reading the rest of the file.
+"""
+import os
+
+import numpy as np
+
+from minesweeper.board import neighbour_counts, place_mines, safe_cells
+
+MAGIC = b"MSBF1"
+HEADER = np.dtype([("m", "<u2"), ("n", "<u2")])
+# bytes before the first record
+OFFSET = len(MAGIC) + HEADER.itemsize
+
+
+def record_dtype(m, n):
+    """Record layout for m x n boards."""
+    return np.dtype([("seed", "<u8"), ("mines", "<u4"),
+                     ("bits", "u1", ((m * n + 7) // 8,))])
+
+
+class BoardWriter():
+    """Stream boards to a file, appending to one of the same size.
+
+    A trailing partial record left by an interrupted writer is cut off
+    before appending, so it cannot shift the boards written after it.
+    """
+
+    def __init__(self, path, m, n):
+        self.m = m
+        self.n = n
+        self.dtype = record_dtype(m, n)
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        if exists:
+            with BoardFile(path) as boards:
+                if (boards.m, boards.n) != (m, n):
+                    raise ValueError(
+                        f"{path} holds {boards.m} x {boards.n} boards")
+                end = OFFSET + len(boards) * self.dtype.itemsize
+            if os.path.getsize(path) > end:
+                os.truncate(path, end)
+        self.file = open(path, "ab")
+        if not exists:
+            self.file.write(MAGIC)
+            self.file.write(np.array([(m, n)], dtype=HEADER).tobytes())
+
+    def write(self, grids, seeds=None):
+        """Write a reference grid or mine grid, or a stack of them.
+
+        Mines are the -1 cells of a reference grid or the true cells of a
+        boolean grid. seeds is a seed per board, default 0.
+        """
+        grids = np.asarray(grids)
+        mines = grids if grids.dtype == bool else grids == -1
+        mines = mines.reshape(-1, self.m * self.n)
+        records = np.zeros(len(mines), dtype=self.dtype)
+        if seeds is not None:
+            records["seed"] = seeds
+        records["mines"] = np.count_nonzero(mines, axis=1)
+        records["bits"] = np.packbits(mines, axis=1)
+        self.file.write(records.tobytes())
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class BoardFile():
+    """Random access to the boards of a file through a memory map.
+
+    boards[k] is the reference grid of board k, and a slice gives a stack
+    of them. A trailing partial record, e.g. from an interrupted writer,
+    is ignored.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a minesweeper board file")
+            header = np.frombuffer(f.read(HEADER.itemsize), dtype=HEADER)[0]
+        self.m = int(header["m"])
+        self.n = int(header["n"])
+        dtype = record_dtype(self.m, self.n)
+        count = (os.path.getsize(path) - OFFSET) // dtype.itemsize
+        self.records = np.memmap(path, dtype=dtype, mode="r", offset=OFFSET,
+                                 shape=(count,)) if count else \
+            np.zeros(0, dtype=dtype)
+
+    def __len__(self):
+        return len(self.records)
+
+    def seeds(self):
+        """Seed of every board."""
+        return self.records["seed"]
+
+    def mine_counts(self):
+        """Mine count of every board."""
+        return self.records["mines"]
+
+    def mines(self, k):
+        """Boolean mine grid of board k, or a stack for a slice."""
+        bits = self.records["bits"][k]
+        shape = (self.m, self.n) if bits.ndim == 1 else (-1, self.m, self.n)
+        mines = np.unpackbits(bits, axis=-1, count=self.m * self.n)
+        return mines.reshape(shape).view(bool)
+
+    def __getitem__(self, k):
+        mines = self.mines(k)
+        ref_grid = neighbour_counts(mines)
+        ref_grid[mines] = -1
+        return ref_grid
+
+    def __iter__(self):
+        # unpack in batches rather than board by board
+        for start in range(0, len(self), 1024):
+            yield from self[start:start + 1024]
+
+    def close(self):
+        self.records = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def generate(path, m, n, mines, count, seed=None, safe=None, opening=False,
+             batch=4096):
+    """Append count random boards to path, each from its own stored seed.
+
+    The seeds are drawn from seed, so board k can be rebuilt with
+    create_reference(m, n, mines, seeds[k], safe, opening).
+    """
+    seeds = np.random.SeedSequence(seed).generate_state(count, np.uint64)
+    exclude = safe_cells(m, n, safe, opening)
+    with BoardWriter(path, m, n) as writer:
+        for start in range(0, count, batch):
+            chunk = seeds[start:start + batch]
+            # only the mines are stored, so skip counting neighbours
+            writer.write([place_mines(m, n, mines, int(s), exclude)
+                          for s in chunk], chunk)
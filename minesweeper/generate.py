@@ -0,0 +1,55 @@
+"""Generate minesweeper boards that can be solved without guessing."""
+from itertools import count as counter
+
+import numpy as np
+
+from games.pool import ordered_map
+from minesweeper.board import create_reference
+from minesweeper.solver import play
+from minesweeper.state import Board
+
+
+def solvable(ref_grid, start):
+    """Check if a board can be finished by logic alone from start."""
+    won, guesses = play(Board(ref_grid), start, guess=False)
+    return won
+
+
+def create_no_guess_reference(m, n, mines, start=None, rng=None,
+                              opening=True, attempts=None):
+    """Create a grid that the solver can finish without guessing.
+
+    The first click at start (default the centre) is always safe, and with
+    opening it reveals a zero. Boards are drawn until one is solvable, or
+    None is returned after attempts tries.
+    """
+    rng = np.random.default_rng(rng)
+    if start is None:
+        start = (m // 2, n // 2)
+    tries = counter() if attempts is None else range(0, attempts)
+    for _ in tries:
+        ref_grid = create_reference(m, n, mines, rng, safe=start,
+                                    opening=opening)
+        if solvable(ref_grid, start):
+            return ref_grid
+    return None
+
+
+def _no_guess_worker(args):
+    """Process pool entry point: one no guess board from a seed."""
+    m, n, mines, start, opening, seed = args
+    return create_no_guess_reference(m, n, mines, start, seed, opening)
+
+
+def generate_no_guess(m, n, mines, count=None, start=None, seed=None,
+                      opening=True, processes=None):
+    """Yield no guess grids, count of them or forever if count is None.
+
+    Boards are produced in order from independent child seeds of seed, so
+    a seed gives the same stream whatever the number of processes. With
+    processes above one, boards are generated in a process pool.
+    """
+    root = np.random.SeedSequence(seed)
+    boards = counter() if count is None else range(0, count)
+    jobs = ((m, n, mines, start, opening, root.spawn(1)[0]) for _ in boards)
+    yield from ordered_map(_no_guess_worker, jobs, processes)
@@ -0,0 +1,367 @@
+"""Huge and unbounded minesweeper boards generated in chunks.
+
+Mines are drawn per chunk from (seed, chunk row, chunk column), so any
+chunk can be rebuilt at any time and only the player's revealed/flag
+state needs keeping. Chunks are created when first played on and held in
+an LRU cache; cold chunks that were played on are written to disk and
+read back on demand, so memory follows the explored area, not the board.
+"""
+from collections import OrderedDict
+from functools import lru_cache
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from minesweeper.board import neighbour_counts
+from minesweeper.reveal import cascade, offsets, spread
+from minesweeper.state import (FLAG, HIDDEN, MINE, STATE_FLAGGED,
+                               STATE_HIDDEN, STATE_REVEALED, SYMBOLS)
+
+# cells along each side of a chunk
+CHUNK = 64
+# above this chance of a cell being a zero, zeros form one endless region
+PERCOLATION = 0.4
+# largest board on which such a region may be opened
+CASCADE_CELLS = 2 ** 24
+
+
+def _zigzag(x):
+    """Map an integer to a non-negative one: 0, -1, 1, -2 to 0, 1, 2, 3."""
+    return 2 * x if x >= 0 else -2 * x - 1
+
+
+@lru_cache(maxsize=1024)
+def chunk_mines(seed, ci, cj, size=CHUNK, density=0.16, m=None, n=None,
+                safe=(0, 0)):
+    """Boolean size x size mine grid of chunk (ci, cj).
+
+    Each cell is a mine with probability density, except cells off an m x n
+    board (None for unbounded) and the 3 x 3 block around safe.
+    """
+    rng = np.random.default_rng([seed, _zigzag(ci), _zigzag(cj)])
+    mines = rng.random((size, size)) < density
+    rows = ci * size + np.arange(size)
+    cols = cj * size + np.arange(size)
+    if m is not None:
+        mines[(rows < 0) | (rows >= m)] = False
+    if n is not None:
+        mines[:, (cols < 0) | (cols >= n)] = False
+    mines[(abs(rows - safe[0]) <= 1)[:, None]
+          & (abs(cols - safe[1]) <= 1)[None, :]] = False
+    mines.flags.writeable = False
+    return mines
+
+
+class Chunk():
+    """Padded count and state layers of one chunk.
+
+    The one cell border of ref holds the counts of the neighbouring chunks'
+    edge cells, and the border of state is marked revealed so cascades stop
+    at the chunk edge.
+    """
+
+    __slots__ = ("ref", "state", "refv", "statev", "dirty")
+
+    def __init__(self, ref, state):
+        self.ref = ref
+        self.state = state
+        self.refv = memoryview(ref.ravel())
+        self.statev = memoryview(state.ravel())
+        # state changed since it was last written to disk
+        self.dirty = False
+
+
+class InfiniteBoard():
+    """Minesweeper board built lazily from fixed size chunks.
+
+    m and n bound the rows and columns from 0, or leave them None for a
+    board unbounded in both directions. Every cell is a mine with
+    probability density, apart from the 3 x 3 block around safe, which is
+    the place to start. At most cache_size chunks are kept in memory and
+    the rest of the played chunks are stored under path (a temporary
+    directory by default, removed by close). Won boards are not detected,
+    as the mines are not counted ahead of play.
+
+    Densities so low that the zero cells percolate are only allowed on
+    bounded boards of at most CASCADE_CELLS cells, as elsewhere a single
+    click would open an endless (or vast) region.
+    """
+
+    __slots__ = ("seed", "density", "m", "n", "safe", "size", "cache_size",
+                 "path", "chunks", "saved", "flags", "revealed_safe",
+                 "status", "_temporary", "_width", "_edge")
+
+    def __init__(self, seed=None, density=0.16, m=None, n=None, safe=(0, 0),
+                 size=CHUNK, cache_size=256, path=None):
+        # a cell is a zero when it and its eight neighbours are not mines
+        if (1 - density) ** 9 >= PERCOLATION and (
+                m is None or n is None or m * n > CASCADE_CELLS):
+            raise ValueError(f"Density {density} opens too much of the "
+                             "board from one click")
+        if seed is None:
+            seed = int(np.random.SeedSequence().generate_state(1)[0])
+        self.seed = seed
+        self.density = density
+        self.m = m
+        self.n = n
+        self.safe = tuple(safe)
+        self.size = size
+        self.cache_size = cache_size
+        self._temporary = path is None
+        self.path = tempfile.mkdtemp(prefix="minesweeper-") if path is None \
+            else path
+        os.makedirs(self.path, exist_ok=True)
+        # chunk key to Chunk, least recently used first
+        self.chunks = OrderedDict()
+        # keys of chunks written to disk
+        self.saved = set()
+        self.flags = 0
+        self.revealed_safe = 0
+        # 0 playing, -1 lost
+        self.status = 0
+        self._width = size + 2
+        # padded flat indices of the edge cells of a chunk
+        inner = np.zeros((self._width, self._width), dtype=bool)
+        inner[1:-1, 1:-1] = True
+        inner[2:-2, 2:-2] = False
+        self._edge = frozenset(np.flatnonzero(inner).tolist())
+
+    @property
+    def lost(self):
+        return self.status == -1
+
+    @property
+    def over(self):
+        return self.status != 0
+
+    @property
+    def nbytes(self):
+        """Bytes held by the chunks in memory."""
+        return sum(chunk.ref.nbytes + chunk.state.nbytes
+                   for chunk in self.chunks.values())
+
+    def in_bounds(self, i, j):
+        """Check if (i, j) lies on the board."""
+        return ((self.m is None or 0 <= i < self.m)
+                and (self.n is None or 0 <= j < self.n))
+
+    def _file(self, key):
+        return os.path.join(self.path, f"{key[0]}_{key[1]}.npy")
+
+    def _mines(self, ci, cj):
+        return chunk_mines(self.seed, ci, cj, self.size, self.density,
+                           self.m, self.n, self.safe)
+
+    def _build(self, key):
+        """Generate the padded layers of a chunk from the seed."""
+        ci, cj = key
+        size = self.size
+        # mines of the chunk and its eight neighbours, cropped to two cells
+        # around the chunk so the border counts are right
+        block = np.block([[self._mines(ci + di, cj + dj)
+                           for dj in (-1, 0, 1)] for di in (-1, 0, 1)])
+        mines = block[size - 2:2 * size + 2, size - 2:2 * size + 2]
+        ref = neighbour_counts(mines)[1:-1, 1:-1]
+        ref[mines[1:-1, 1:-1]] = -1
+        state = np.full(ref.shape, STATE_REVEALED, dtype=np.uint8)
+        state[1:-1, 1:-1] = STATE_HIDDEN
+        # cells off the board count as revealed so cascades stop there
+        rows = ci * size + np.arange(-1, size + 1)
+        cols = cj * size + np.arange(-1, size + 1)
+        if self.m is not None:
+            state[(rows < 0) | (rows >= self.m)] = STATE_REVEALED
+        if self.n is not None:
+            state[:, (cols < 0) | (cols >= self.n)] = STATE_REVEALED
+        return ref, state
+
+    def _chunk(self, key):
+        """Chunk for key, from the cache, from disk or newly generated."""
+        chunk = self.chunks.get(key)
+        if chunk is not None:
+            self.chunks.move_to_end(key)
+            return chunk
+        ref, state = self._build(key)
+        if key in self.saved:
+            state = np.load(self._file(key))
+        chunk = Chunk(ref, state)
+        self.chunks[key] = chunk
+        return chunk
+
+    def _evict(self):
+        """Write cold chunks to disk until the cache fits.
+
+        Only run between moves, so no chunk in use is dropped.
+        """
+        while len(self.chunks) > self.cache_size:
+            key, chunk = self.chunks.popitem(last=False)
+            if chunk.dirty:
+                np.save(self._file(key), chunk.state)
+                self.saved.add(key)
+
+    def _locate(self, i, j):
+        """Chunk key and padded flat index of (i, j)."""
+        ci, li = divmod(i, self.size)
+        cj, lj = divmod(j, self.size)
+        return (ci, cj), (li + 1) * self._width + lj + 1
+
+    def _open(self, i, j):
+        """Reveal (i, j) and cascade across chunks, returning cells."""
+        key, k = self._locate(i, j)
+        chunk = self._chunk(key)
+        changed = cascade(chunk.refv, chunk.statev, k, self._width)
+        if changed and chunk.refv[k] == -1:
+            chunk.dirty = True
+            self.status = -1
+            return [(i, j)]
+        # a number also opens zeros it touches in the next chunks
+        starts = {}
+        if changed and chunk.refv[k] > 0 and k in self._edge:
+            self._cross(key, chunk, k, starts, zeros=True)
+        cells = []
+        pending = [(key, chunk, changed)]
+        while pending:
+            key, chunk, changed = pending.pop()
+            if changed:
+                chunk.dirty = True
+                self.revealed_safe += len(changed)
+                cells.extend(self._cell(key, k) for k in changed)
+            # zeros on the chunk edge open cells in the next chunks
+            for k in self._edge.intersection(changed):
+                if chunk.refv[k] == 0:
+                    self._cross(key, chunk, k, starts)
+            for nkey, ks in starts.items():
+                nchunk = self._chunk(nkey)
+                opened = []
+                stack = []
+                for nk in ks:
+                    if not nchunk.statev[nk]:
+                        nchunk.statev[nk] = STATE_REVEALED
+                        opened.append(nk)
+                        if nchunk.refv[nk] == 0:
+                            stack.append(nk)
+                spread(nchunk.refv, nchunk.statev, stack, self._width, opened)
+                pending.append((nkey, nchunk, opened))
+            starts = {}
+        return cells
+
+    def _cross(self, key, chunk, k, starts, zeros=False):
+        """Add the neighbours of edge cell k in other chunks to starts.
+
+        starts maps chunk keys to sets of padded flat indices. With zeros
+        only neighbours with no adjacent mines are added.
+        """
+        for o in offsets(self._width):
+            nb = k + o
+            if self._outside(nb) and not (zeros and chunk.refv[nb] != 0):
+                cell = self._cell(key, nb)
+                if self.in_bounds(*cell):
+                    nkey, nk = self._locate(*cell)
+                    starts.setdefault(nkey, set()).add(nk)
+
+    def _outside(self, k):
+        """Check if padded flat index k is on the chunk border."""
+        r, c = divmod(k, self._width)
+        return r == 0 or c == 0 or r == self._width - 1 or \
+            c == self._width - 1
+
+    def _cell(self, key, k):
+        """Board position of padded flat index k of chunk key."""
+        r, c = divmod(k, self._width)
+        return (key[0] * self.size + r - 1, key[1] * self.size + c - 1)
+
+    def reveal(self, i, j):
+        """Reveal a cell, returning a list of cells that changed."""
+        if self.over or not self.in_bounds(i, j):
+            return []
+        cells = self._open(i, j)
+        self._evict()
+        return cells
+
+    def flag(self, i, j):
+        """Toggle a flag on a hidden cell, returning cells that changed."""
+        if self.over or not self.in_bounds(i, j):
+            return []
+        key, k = self._locate(i, j)
+        chunk = self._chunk(key)
+        state = chunk.statev[k]
+        if state == STATE_REVEALED:
+            return []
+        chunk.statev[k] = STATE_HIDDEN if state == STATE_FLAGGED \
+            else STATE_FLAGGED
+        self.flags += 1 if state == STATE_HIDDEN else -1
+        chunk.dirty = True
+        self._evict()
+        return [(i, j)]
+
+    def chord(self, i, j):
+        """Reveal unflagged neighbours of a number with all mines flagged."""
+        if self.over or not self.in_bounds(i, j):
+            return []
+        value = self.cell(i, j)
+        if not 0 < value < HIDDEN:
+            return []
+        around = [(i + di, j + dj) for di in (-1, 0, 1) for dj in (-1, 0, 1)
+                  if (di or dj) and self.in_bounds(i + di, j + dj)]
+        if sum(self.cell(*nb) == FLAG for nb in around) != value:
+            return []
+        cells = []
+        for nb in around:
+            if self.cell(*nb) == HIDDEN and not self.over:
+                cells.extend(self._open(*nb))
+        self._evict()
+        return cells
+
+    def cell(self, i, j):
+        """Code of a single cell in the player view."""
+        key, k = self._locate(i, j)
+        if key not in self.chunks and key not in self.saved:
+            return HIDDEN
+        chunk = self._chunk(key)
+        state = chunk.statev[k]
+        if state == STATE_HIDDEN:
+            return HIDDEN
+        if state == STATE_FLAGGED:
+            return FLAG
+        value = chunk.refv[k]
+        return MINE if value == -1 else value
+
+    def view(self, top, left, rows, cols):
+        """Player view of a window as a rows x cols grid of cell codes."""
+        if not (self.in_bounds(top, left)
+                and self.in_bounds(top + rows - 1, left + cols - 1)):
+            raise ValueError("Window must lie on the board")
+        grid = np.full((rows, cols), HIDDEN, dtype=np.uint8)
+        size = self.size
+        for ci in range(top // size, (top + rows - 1) // size + 1):
+            for cj in range(left // size, (left + cols - 1) // size + 1):
+                key = (ci, cj)
+                if key not in self.chunks and key not in self.saved:
+                    continue
+                chunk = self._chunk(key)
+                # overlap of the window and the chunk in board coordinates
+                r0, r1 = max(top, ci * size), min(top + rows, (ci + 1) * size)
+                c0, c1 = max(left, cj * size), min(left + cols,
+                                                   (cj + 1) * size)
+                rs = slice(r0 - ci * size + 1, r1 - ci * size + 1)
+                cs = slice(c0 - cj * size + 1, c1 - cj * size + 1)
+                state = chunk.state[rs, cs]
+                block = np.where(state == STATE_REVEALED, chunk.ref[rs, cs],
+                                 HIDDEN)
+                block[block == -1] = MINE
+                block[state == STATE_FLAGGED] = FLAG
+                grid[r0 - top:r1 - top, c0 - left:c1 - left] = block
+        self._evict()
+        return grid
+
+    def player_grid(self, top, left, rows, cols):
+        """Player view of a window as a grid of strings."""
+        return SYMBOLS[self.view(top, left, rows, cols)]
+
+    def close(self):
+        """Drop the cache and remove the chunk directory if temporary."""
+        self.chunks.clear()
+        self.saved.clear()
+        if self._temporary:
+            shutil.rmtree(self.path, ignore_errors=True)
@@ -1,197 +1,86 @@
 """Implements the game minesweeper."""
 import numpy as np
-import pandas as pd
 
+from games.instrument import timed
+from minesweeper import replay
+# create_reference stays importable from here for existing callers
+from minesweeper.board import create_reference
+from minesweeper.state import Board
 
-def count_mines(i, j, grid):
-    """Count number of surrounding mines to a point."""
-    count = 0
-    for pos in [(i + 1, j), (i + 1, j + 1), (i, j + 1), (i - 1, j + 1),
-                (i - 1, j), (i - 1, j - 1), (i, j - 1), (i + 1, j - 1)]:
-        count += grid[pos]
-    return -count
 
-
-def create_reference(m, n, mines):
-    """Create a grid containing mines and counts."""
-    # mines number of mines, and the rest empty
-    arr = np.array([-1] * mines + [0] * (m * n - mines))
-    # randomise locations
-    np.random.shuffle(arr)
-    # reshape into m x n grid
-    ref_grid = np.reshape(arr, (m, n))
-    # copy with zero border to avoid indexing issues
-    ref_copy = np.pad(ref_grid, [(1, 1), (1, 1)])
-    # count on ref_copy, add counts to ref_grid
-    for i in range(0, m):
-        for j in range(0, n):
-            # only count if not a mine
-            if ref_grid[i, j] != -1:
-                # (i, j) on grid is (i + 1, j + 1) on copy, as prepended row
-                # and col
-                ref_grid[i, j] = count_mines(i + 1, j + 1, ref_copy)
-    return ref_grid
-
-
-def player_move(ref_grid, player_grid, flags, mines_flagged, gamestate):
+def player_move(board):
+    """Take a move from the player and apply it to the board."""
     # take input of position and flag/not
     i = int(input("Row: "))
     j = int(input("Col: "))
-    type = input("Flag (f)? ")
-    # add flag to player view
+    type = input("Flag (f) or chord (c)? ")
+    # toggle flag on player view
     if type == "f":
-        player_grid[i, j] = "F"
-        # record flag and if it is correct
-        flags += 1
-        if ref_grid[i, j] == -1:
-            mines_flagged += 1
-    # check normal move: explode mine or record info on player grid
+        board.flag(i, j)
+    # reveal around a number whose mines are all flagged
+    elif type == "c":
+        board.chord(i, j)
+        if board.lost:
+            print("You lose!")
+    # normal move: explode mine or reveal squares
     else:
-        # if mine: explode
-        if ref_grid[i, j] == -1:
+        board.reveal(i, j)
+        if board.lost:
             print("You lose!")
-            player_grid[i, j] = "*"
-            gamestate = False
-        # if not mine: display value
-        else:
-            player_grid[i, j] = ref_grid[i, j]
-
-            """
-            def check_neighbours(x, y):
-                Look at neighbouring squares for 0s.
-                for pos in [(x + 1, y), (x + 1, y + 1), (x, y + 1),
-                            (x - 1, y + 1), (x - 1, y), (x - 1, y - 1),
-                            (x, y - 1), (x + 1, y - 1)]:
-                    # if initial square is 0, reveal all neighbours
-                    if ref_grid[x, y] == 0 and pos[0] >= 0 and pos[1] >= 0:
-                        try:
-                            player_grid[pos] = ref_grid[pos]
-                        except IndexError:
-                            None
-                    else:
-                        # otherwise: check all possible neigbours for zeroes
-                        try:
-                            if ref_grid[pos] == 0 and (pos[0] >= 0
-                                                       and pos[1] >= 0):
-                                player_grid[pos] = ref_grid[pos]
-                        except IndexError:
-                            None
-            #check_neighbours(i, j)
-
-            def show_neighbours(x, y, ref_grid, player_grid):
-                Show all neighbours of square.
-                for pos in [(x + 1, y), (x + 1, y + 1), (x, y + 1),
-                            (x - 1, y + 1), (x - 1, y), (x - 1, y - 1),
-                            (x, y - 1), (x + 1, y - 1)]:
-                    try:
-                        player_grid[pos] = ref_grid[pos]
-                    except IndexError:
-                        None
-                return ref_grid, player_grid
-            
-            # if zero square, show all neighbours to player
-            if ref_grid[i, j] == 0:
-                ref_grid, player_grid = show_neighbours(i, j, ref_grid, player_grid)
-            """
-
-
-            def neighbours(x,  y):
-                """List of indices of neigbours of (x,y)."""
-                # list of all possible neigbours
-                idx = [(x + 1, y), (x + 1, y + 1), (x, y + 1),
-                            (x - 1, y + 1), (x - 1, y), (x - 1, y - 1),
-                            (x, y - 1), (x + 1, y - 1)]
-                # list of neighbours
-                n_idx = []
-                # add those within the grid
-                for pos in idx:
-                    try:
-                        ref_grid[pos]
-                        n_idx.append(pos)
-                    except IndexError:
-                        None
-                return n_idx
-
-
-            def zero_method(x, y, ref_grid, player_grid):
-                """Call on zero squares to find all connected zeroes and border."""
-                # list of connected zeros
-                zero_list = []
-                # list of border
-                border_list = []
-                
-                def f(x,y):
-                    # loop over all neighbours
-                    for pos in neighbours(x,y):
-                        # if zero and not in list, add to list and call f
-                        if ref_grid[pos] == 0 and not pos in zero_list:
-                            zero_list.append(pos)
-                            f(pos[0],pos[1])
-                        # if not zero and not in border list, add
-                        elif not pos in border_list:
-                            border_list.append(pos)
-                
-                f(x,y)
-
-                # now add all zeros and borders found to player view
-                for pos in zero_list:
-                    player_grid[pos] = ref_grid[pos]
-                for pos in border_list:
-                    player_grid[pos] = ref_grid[pos]
-                
-                return ref_grid, player_grid
-            
-
-            # if move is a zero, call method
-            if ref_grid[i, j] == 0:
-                ref_grid, player_grid = zero_method(i, j, ref_grid, player_grid)
-            # if not, call on any neighbouring zeros
-            else:
-                nbs = neighbours(i, j)
-                for pos in nbs:
-                    if ref_grid[pos] == 0:
-                        ref_grid, player_grid = zero_method(pos[0], pos[1], ref_grid, player_grid)
-
-    return ref_grid, player_grid, flags, mines_flagged, gamestate
+    return board
+
+
+def format_grid(grid):
+    """Player grid as text with row and column numbers.
+
+    Columns are right aligned to their widest entry, in the layout of a
+    printed DataFrame.
+    """
+    grid = np.asarray(grid, dtype=str)
+    m, n = grid.shape
+    labels = np.arange(0, n).astype(str)
+    widths = np.maximum(np.char.str_len(labels),
+                        np.char.str_len(grid).max(axis=0, initial=0))
+    index = len(str(m - 1))
+    lines = [" " * index + "".join(
+        "  " + label.rjust(width) for label, width in zip(labels, widths))]
+    for i in range(0, m):
+        lines.append(str(i).ljust(index) + "".join(
+            "  " + x.rjust(width) for x, width in zip(grid[i], widths)))
+    return "\n".join(lines)
 
 
 def display_grid(grid):
     """Pretty print player grid."""
-    df = pd.DataFrame(grid)
-    print(df.to_string(header=True, index=True))
+    print(format_grid(grid))
 
 
-def game(m, n, mines):
-    """Run the game."""
-    # create reference grid: mine locations and counts
-    ref_grid = create_reference(m, n, mines)
+def game(m, n, mines, stats=None, record=None):
+    """Run the game.
 
-    # create a player grid
-    player_grid = np.array(["-"] * m * n).reshape((m, n))
-
-    gamestate = True
-    flags = 0
-    mines_flagged = 0
+    stats is an optional games.instrument.Stats to record timings in. If
+    record is a path, the seed and moves are appended to that replay log.
+    """
+    # create board: mine locations, counts and player view
+    if record is None:
+        board = Board.create(m, n, mines)
+    else:
+        board, recording = replay.record(m, n, mines)
 
     # start game
-    while gamestate:
+    while not board.over:
         # allow player move
-        ref_grid, player_grid, flags, mines_flagged, gamestate = player_move(
-            ref_grid, player_grid, flags, mines_flagged, gamestate)
+        revealed = board.revealed_safe
+        timed(stats, "move", player_move, board)
+        if stats is not None:
+            stats.move(board.revealed_safe - revealed)
 
         # display player grid
-        display_grid(player_grid)
+        timed(stats, "display", display_grid, board.player_grid())
 
-        # check if all mines flagged
-        if mines == flags and mines == mines_flagged:
-            print("You win! number")
-            gamestate = False
+        # check if all mines flagged or all squares revealed
+        if board.won:
+            print("You win!")
 
-        # check if flags match up with mines
-        mine_x = list(np.where(ref_grid == -1)[0])
-        mine_y = list(np.where(ref_grid == -1)[1])
-        flag_x = list(np.where(player_grid == "F")[0])
-        flag_y = list(np.where(player_grid == "F")[1])
-        if (mine_x == flag_x) and (mine_y == flag_y):
-            print("You win! location")
-            gamestate = False
\ No newline at end of file
+    if record is not None:
+        replay.append(record, [recording])
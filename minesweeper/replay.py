@@ -0,0 +1,126 @@
+"""Deterministic replay logs for minesweeper.
+
+A log file is MAGIC followed by records. Each record is a HEADER holding
+the board size, mine count, seed and safe start, then count MOVE entries
+of (row, col, action). The board is rebuilt from the seed, so a record
+costs 29 bytes plus 5 bytes per move.
+"""
+import numpy as np
+
+from minesweeper.board import create_reference
+from minesweeper.state import MOVE_CHORD, MOVE_FLAG, MOVE_REVEAL, Board
+
+MAGIC = b"MSRP1"
+HEADER = np.dtype([("m", "<u2"), ("n", "<u2"), ("mines", "<u4"),
+                   ("seed", "<u8"), ("safe_row", "<i4"), ("safe_col", "<i4"),
+                   ("opening", "u1"), ("count", "<u4")])
+MOVE = np.dtype([("row", "<u2"), ("col", "<u2"), ("action", "u1")])
+
+
+class Recording():
+    """Seed, board settings and moves of one game."""
+
+    __slots__ = ("m", "n", "mines", "seed", "safe", "opening", "moves")
+
+    def __init__(self, m, n, mines, seed=None, safe=None, opening=False,
+                 moves=None):
+        if seed is None:
+            seed = int(np.random.SeedSequence().generate_state(
+                1, np.uint64)[0])
+        self.m = m
+        self.n = n
+        self.mines = mines
+        self.seed = seed
+        self.safe = safe
+        self.opening = opening
+        # list of (row, col, action) or a MOVE array
+        self.moves = [] if moves is None else moves
+
+    def board(self):
+        """Fresh board generated from the seed."""
+        return Board(create_reference(self.m, self.n, self.mines, self.seed,
+                                      self.safe, self.opening))
+
+    def to_bytes(self):
+        """Binary record: header then moves."""
+        safe = (-1, -1) if self.safe is None else self.safe
+        header = np.array([(self.m, self.n, self.mines, self.seed, safe[0],
+                            safe[1], self.opening, len(self.moves))],
+                          dtype=HEADER)
+        moves = np.array([tuple(move) for move in self.moves], dtype=MOVE)
+        return header.tobytes() + moves.tobytes()
+
+
+def record(m, n, mines, seed=None, safe=None, opening=False):
+    """Start a recorded game, returning the board and its recording.
+
+    Every move made on the board is appended to the recording.
+    """
+    recording = Recording(m, n, mines, seed, safe, opening)
+    board = recording.board()
+    board.log = recording.moves
+    return board, recording
+
+
+def append(path, recordings):
+    """Append recordings to a log file, starting it if needed."""
+    with open(path, "ab") as f:
+        if f.tell() == 0:
+            f.write(MAGIC)
+        for recording in recordings:
+            f.write(recording.to_bytes())
+
+
+def read(path):
+    """Yield the recordings of a log file.
+
+    The file is memory mapped and each recording's moves are a view into it,
+    so logs larger than memory can be streamed. A log ending in a partial
+    record, e.g. from an interrupted writer, raises ValueError when that
+    record is reached.
+    """
+    data = np.memmap(path, dtype=np.uint8, mode="r")
+    if bytes(data[:len(MAGIC)]) != MAGIC:
+        raise ValueError(f"{path} is not a minesweeper replay log")
+    offset = len(MAGIC)
+    while offset < len(data):
+        if offset + HEADER.itemsize > len(data):
+            raise ValueError(f"{path} ends in a partial record")
+        header = data[offset:offset + HEADER.itemsize].view(HEADER)[0]
+        offset += HEADER.itemsize
+        end = offset + int(header["count"]) * MOVE.itemsize
+        if end > len(data):
+            raise ValueError(f"{path} ends in a partial record")
+        moves = data[offset:end].view(MOVE)
+        offset = end
+        safe = None
+        if header["safe_row"] >= 0:
+            safe = (int(header["safe_row"]), int(header["safe_col"]))
+        yield Recording(int(header["m"]), int(header["n"]),
+                        int(header["mines"]), int(header["seed"]), safe,
+                        bool(header["opening"]), moves)
+
+
+def replay(recording):
+    """Replay a recording, returning the finished board."""
+    board = recording.board()
+    actions = {MOVE_REVEAL: board.reveal, MOVE_FLAG: board.flag,
+               MOVE_CHORD: board.chord}
+    moves = recording.moves
+    if isinstance(moves, np.ndarray):
+        moves = zip(moves["row"].tolist(), moves["col"].tolist(),
+                    moves["action"].tolist())
+    for i, j, action in moves:
+        actions[action](i, j)
+    return board
+
+
+def replay_file(path):
+    """Replay every game of a log file.
+
+    Yields (status, revealed safe cells, flags) for each game, status being
+    1 won, -1 lost or 0 unfinished.
+    """
+    for recording in read(path):
+        board = replay(recording)
+        yield board.status, board.revealed_safe, board.flags
@@ -0,0 +1,89 @@
+"""Reveal cascade for minesweeper."""
+import numpy as np
+
+
+def neighbours(x, y, m, n):
+    """List of indices of neighbours of (x, y) within an m x n grid."""
+    return [(i, j)
+            for i in range(max(x - 1, 0), min(x + 2, m))
+            for j in range(max(y - 1, 0), min(y + 2, n))
+            if (i, j) != (x, y)]
+
+
+def offsets(width):
+    """Flat offsets of the eight neighbours on a board of given row width."""
+    return (-width - 1, -width, -width + 1, -1, 1, width - 1, width, width + 1)
+
+
+def cascade(ref, done, start, width):
+    """Flood fill from flat index start, returning flat indices revealed.
+
+    ref and done are flat buffers over a board padded with a one cell
+    border, which must be marked as done so the fill never leaves the
+    board. A zero spreads to all connected zeros and their border, and a
+    number also opens any zero regions it touches. done is updated in place.
+    """
+    if done[start]:
+        return []
+    done[start] = 1
+    changed = [start]
+    # a mine does not cascade
+    if ref[start] == -1:
+        return changed
+    if ref[start] == 0:
+        stack = [start]
+    else:
+        stack = []
+        for o in offsets(width):
+            nb = start + o
+            if ref[nb] == 0 and not done[nb]:
+                done[nb] = 1
+                changed.append(nb)
+                stack.append(nb)
+    return spread(ref, done, stack, width, changed)
+
+
+def spread(ref, done, stack, width, changed=None):
+    """Open the neighbours of the revealed zeros on stack, cascading on.
+
+    Buffers are as for cascade. Returns the list changed (a new one if not
+    given) with the flat indices opened appended. stack is emptied.
+    """
+    if changed is None:
+        changed = []
+    # depth first search over zeros, each cell is visited once
+    around = offsets(width)
+    while stack:
+        k = stack.pop()
+        for o in around:
+            nb = k + o
+            if not done[nb]:
+                done[nb] = 1
+                changed.append(nb)
+                if ref[nb] == 0:
+                    stack.append(nb)
+    return changed
+
+
+def reveal(ref_grid, x, y, revealed=None):
+    """Return the set of cells uncovered by clicking (x, y).
+
+    Cells marked in the optional boolean revealed grid are skipped, and the
+    grid is updated in place.
+    """
+    m, n = ref_grid.shape
+    # pad so neighbours never need bounds checks
+    ref = np.pad(np.asarray(ref_grid, dtype=np.int8), 1)
+    if revealed is None:
+        done = np.ones((m + 2, n + 2), dtype=np.uint8)
+        done[1:-1, 1:-1] = 0
+    else:
+        done = np.pad(revealed.astype(np.uint8), 1, constant_values=1)
+    width = n + 2
+    changed = cascade(memoryview(ref.ravel()), memoryview(done.ravel()),
+                      (x + 1) * width + y + 1, width)
+    cells = {(k // width - 1, k % width - 1) for k in changed}
+    if revealed is not None:
+        for pos in cells:
+            revealed[pos] = True
+    return cells
@@ -0,0 +1,308 @@
+"""Constraint solver and bot for minesweeper."""
+import math
+
+import numpy as np
+
+from minesweeper.board import neighbour_counts
+from minesweeper.state import FLAG, HIDDEN, Board
+
+# most configurations enumerated per frontier component before falling back
+# to an estimate
+MAX_SOLUTIONS = 200000
+# largest component enumerated, bounding the search depth
+MAX_CELLS = 400
+
+
+def constraints(view):
+    """List (cells, value) from revealed numbers next to hidden cells.
+
+    view is a player view of cell codes (see Board.view), flags count as
+    hidden. Cells are flat indices into the board.
+    """
+    m, n = view.shape
+    hidden = (view == HIDDEN) | (view == FLAG)
+    border = (view < HIDDEN) & (neighbour_counts(hidden) > 0)
+    hidden_flat = hidden.ravel().tolist()
+    result = []
+    for i, j in zip(*np.nonzero(border)):
+        cells = frozenset(
+            r * n + c
+            for r in range(max(i - 1, 0), min(i + 2, m))
+            for c in range(max(j - 1, 0), min(j + 2, n))
+            if hidden_flat[r * n + c])
+        result.append((cells, int(view[i, j])))
+    return result
+
+
+def propagate(cons, safe, mines):
+    """Apply single cell and subset rules until nothing new is found.
+
+    safe and mines are sets of cells updated in place. Returns the reduced
+    constraints over the remaining unknown cells.
+    """
+    while True:
+        # single cell rules on constraints reduced by known cells
+        reduced = {}
+        found = False
+        for cells, value in cons:
+            value -= len(cells & mines)
+            cells = cells - safe - mines
+            if not cells:
+                continue
+            if value == 0:
+                safe |= cells
+                found = True
+            elif value == len(cells):
+                mines |= cells
+                found = True
+            else:
+                reduced[cells] = value
+        cons = list(reduced.items())
+        if found:
+            continue
+        # subset rule: if a is inside b, b - a holds value b - value a
+        by_cell = {}
+        for k, (cells, value) in enumerate(cons):
+            for cell in cells:
+                by_cell.setdefault(cell, []).append(k)
+        new = {}
+        for cells, value in cons:
+            others = set()
+            for cell in cells:
+                others.update(by_cell[cell])
+            for k in others:
+                big, big_value = cons[k]
+                if len(big) > len(cells) and cells < big:
+                    diff = big - cells
+                    if diff not in reduced and diff not in new:
+                        new[diff] = big_value - value
+        if not new:
+            return cons
+        cons = cons + list(new.items())
+
+
+def components(cons):
+    """Group constraints into independent components sharing no cells."""
+    parent = {}
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for cells, value in cons:
+        cells = list(cells)
+        for cell in cells:
+            parent.setdefault(cell, cell)
+        root = find(cells[0])
+        for cell in cells[1:]:
+            parent[find(cell)] = root
+    groups = {}
+    for cells, value in cons:
+        groups.setdefault(find(next(iter(cells))), []).append((cells, value))
+    return list(groups.values())
+
+
+def enumerate_component(cons, limit=MAX_SOLUTIONS):
+    """Count configurations of a component by number of mines.
+
+    Returns the ordered cells, a dict of mine count to number of
+    configurations and a dict of mine count to per cell hit counts, or None
+    if there are more than limit configurations or MAX_CELLS cells.
+    """
+    # order cells so each constraint is completed as early as possible
+    cells = []
+    seen = set()
+    for group, value in sorted(cons, key=lambda c: len(c[0])):
+        for cell in sorted(group):
+            if cell not in seen:
+                seen.add(cell)
+                cells.append(cell)
+    if len(cells) > MAX_CELLS:
+        return None
+    index = {cell: k for k, cell in enumerate(cells)}
+    values = [value for group, value in cons]
+    # constraints touched by each cell and unassigned cells per constraint
+    touches = [[] for cell in cells]
+    left = []
+    for c, (group, value) in enumerate(cons):
+        for cell in group:
+            touches[index[cell]].append(c)
+        left.append(len(group))
+    placed = [0] * len(cons)
+    assignment = np.zeros(len(cells), dtype=np.int64)
+    totals = {}
+    hits = {}
+    state = {"solutions": 0}
+
+    def search(k, mines):
+        if k == len(cells):
+            totals[mines] = totals.get(mines, 0) + 1
+            if mines not in hits:
+                hits[mines] = np.zeros(len(cells), dtype=np.int64)
+            hits[mines] += assignment
+            state["solutions"] += 1
+            return state["solutions"] <= limit
+        for mine in (0, 1):
+            ok = True
+            for c in touches[k]:
+                left[c] -= 1
+                placed[c] += mine
+                if placed[c] > values[c] or placed[c] + left[c] < values[c]:
+                    ok = False
+            assignment[k] = mine
+            if ok and not search(k + 1, mines + mine):
+                return False
+            for c in touches[k]:
+                left[c] += 1
+                placed[c] -= mine
+        assignment[k] = 0
+        return True
+
+    if not search(0, 0):
+        return None
+    return cells, totals, hits
+
+
+def _convolve(polys):
+    """Multiply polynomials given as dicts of power to coefficient."""
+    result = {0: 1}
+    for poly in polys:
+        product = {}
+        for a, x in result.items():
+            for b, y in poly.items():
+                product[a + b] = product.get(a + b, 0) + x * y
+        result = product
+    return result
+
+
+def solve(view, mines):
+    """Find safe cells, mines and mine probabilities for a player view.
+
+    Trivial and subset rules are applied first, then every configuration of
+    each independent frontier component is enumerated and weighted by the
+    ways to place the remaining mines away from the frontier. Returns the
+    sets of (row, col) cells that are certainly safe and certainly mines,
+    and an m x n grid of mine probabilities (nan for revealed cells).
+    """
+    m, n = view.shape
+    hidden = (view == HIDDEN) | (view == FLAG)
+    safe = set()
+    known = set()
+    cons = propagate(constraints(view), safe, known)
+
+    # enumerate each component, estimating those that are too large
+    exact = []
+    estimates = {}
+    polys = []
+    for comp in components(cons):
+        result = enumerate_component(comp)
+        if result is None:
+            share = {}
+            for cells, value in comp:
+                for cell in cells:
+                    share.setdefault(cell, []).append(value / len(cells))
+            probs = {cell: sum(v) / len(v) for cell, v in share.items()}
+            estimates.update(probs)
+            polys.append({round(sum(probs.values())): 1})
+        else:
+            exact.append(result)
+            polys.append(result[1])
+
+    frontier = set(estimates)
+    for cells, totals, hits in exact:
+        frontier.update(cells)
+    outside = int(np.count_nonzero(hidden)) - len(frontier | safe | known)
+    remaining = mines - len(known)
+
+    def weight(k):
+        """Ways to place the rest of the mines away from the frontier."""
+        rest = remaining - k
+        return math.comb(outside, rest) if 0 <= rest <= outside else 0
+
+    probs = np.full((m, n), np.nan)
+    flat = probs.reshape(-1)
+    flat[hidden.ravel()] = 0.0
+    total = _convolve(polys)
+    norm = sum(count * weight(k) for k, count in total.items())
+    if norm == 0:
+        # inconsistent view: fall back to the average density
+        flat[hidden.ravel()] = remaining / max(outside + len(frontier), 1)
+    else:
+        for c, (cells, totals, hits) in enumerate(exact):
+            others = _convolve(polys[:c] + polys[c + 1:])
+            factor = {k: sum(count * weight(k + r)
+                             for r, count in others.items())
+                      for k in totals}
+            scores = sum(hits[k].astype(object) * factor[k] for k in totals)
+            for cell, score in zip(cells, scores):
+                flat[cell] = score / norm
+                if score == 0:
+                    safe.add(cell)
+                elif score == norm:
+                    known.add(cell)
+        for cell, p in estimates.items():
+            flat[cell] = p
+        if outside:
+            expected = sum(count * weight(k) * (remaining - k)
+                           for k, count in total.items())
+            rest = hidden.ravel().copy()
+            rest[list(frontier | safe | known)] = False
+            flat[rest] = expected / norm / outside
+            # every mine accounted for, or every cell left is a mine
+            if expected == 0:
+                safe.update(np.flatnonzero(rest).tolist())
+            elif expected == norm * outside:
+                known.update(np.flatnonzero(rest).tolist())
+    flat[list(safe)] = 0.0
+    flat[list(known)] = 1.0
+    return ({divmod(cell, n) for cell in safe},
+            {divmod(cell, n) for cell in known}, probs)
+
+
+def play(board, start=None, guess=True):
+    """Play a board to the end, returning (won, number of guesses).
+
+    The first click is at start (default the centre) and is not counted as
+    a guess. When no cell is certainly safe the bot reveals the cell with
+    the lowest mine probability, or stops if guess is False.
+    """
+    if start is None:
+        start = (board.m // 2, board.n // 2)
+    board.reveal(*start)
+    guesses = 0
+    while not board.over:
+        safe, mines, probs = solve(board.view(), board.mines)
+        for cell in mines:
+            if board.cell(*cell) != FLAG:
+                board.flag(*cell)
+        if board.over:
+            break
+        if safe:
+            for cell in safe:
+                board.reveal(*cell)
+        elif not guess:
+            break
+        else:
+            # unflagged hidden cells only
+            probs[board.view() == FLAG] = np.nan
+            board.reveal(*divmod(int(np.nanargmin(probs)), board.n))
+            guesses += 1
+    return board.won, guesses
+
+
+def rate(ref_grid, start=None):
+    """Play a reference grid, returning (won, number of guesses)."""
+    return play(Board(ref_grid), start)
+
+
+def rate_many(ref_grids, start=None):
+    """Rate a sequence of reference grids.
+
+    Returns boolean array of wins and integer array of guesses needed.
+    """
+    results = [rate(ref_grid, start) for ref_grid in ref_grids]
+    won = np.array([r[0] for r in results], dtype=bool)
+    guesses = np.array([r[1] for r in results], dtype=np.int64)
+    return won, guesses
@@ -0,0 +1,170 @@
+"""Headless minesweeper game state."""
+import numpy as np
+
+from minesweeper.board import create_reference
+from minesweeper.reveal import cascade, offsets
+
+# cell codes in the player view, 0 to 8 are revealed counts
+HIDDEN = 9
+FLAG = 10
+MINE = 11
+
+# values of the revealed/flagged layer
+STATE_HIDDEN = 0
+STATE_REVEALED = 1
+STATE_FLAGGED = 2
+
+# actions in a move log
+MOVE_REVEAL = 0
+MOVE_FLAG = 1
+MOVE_CHORD = 2
+
+# characters shown for each cell code
+SYMBOLS = np.array([str(i) for i in range(0, 9)] + ["-", "F", "*"])
+
+
+class Board():
+    """Minesweeper board with compact mine/count and revealed/flag layers."""
+
+    __slots__ = ("m", "n", "mines", "ref_grid", "flags", "mines_flagged",
+                 "revealed_safe", "status", "log", "_ref", "_state", "_refv",
+                 "_statev", "_width")
+
+    def __init__(self, ref_grid):
+        ref_grid = np.asarray(ref_grid, dtype=np.int8)
+        self.m, self.n = ref_grid.shape
+        self.mines = int(np.count_nonzero(ref_grid == -1))
+        # padded layers so neighbours never need bounds checks, the border
+        # counts as revealed so cascades stop there
+        self._ref = np.pad(ref_grid, 1)
+        self._state = np.full(self._ref.shape, STATE_REVEALED, dtype=np.uint8)
+        self._state[1:-1, 1:-1] = STATE_HIDDEN
+        self.ref_grid = self._ref[1:-1, 1:-1]
+        self._width = self.n + 2
+        self._refv = memoryview(self._ref.ravel())
+        self._statev = memoryview(self._state.ravel())
+        # counters for constant time win detection
+        self.flags = 0
+        self.mines_flagged = 0
+        self.revealed_safe = 0
+        # 0 playing, 1 won, -1 lost
+        self.status = 0
+        # optional list of (row, col, action) moves, see minesweeper.replay
+        self.log = None
+
+    @classmethod
+    def create(cls, m, n, mines, rng=None):
+        """Create a board with randomly placed mines."""
+        return cls(create_reference(m, n, mines, rng))
+
+    @property
+    def won(self):
+        return self.status == 1
+
+    @property
+    def lost(self):
+        return self.status == -1
+
+    @property
+    def over(self):
+        return self.status != 0
+
+    def in_bounds(self, i, j):
+        """Check if (i, j) lies on the board."""
+        return 0 <= i < self.m and 0 <= j < self.n
+
+    def _index(self, i, j):
+        """Flat index of (i, j) on the padded layers."""
+        return (i + 1) * self._width + j + 1
+
+    def _cell(self, k):
+        """Board position of padded flat index k."""
+        return (k // self._width - 1, k % self._width - 1)
+
+    def _open(self, k):
+        """Reveal padded flat index k and cascade, returning flat indices."""
+        changed = cascade(self._refv, self._statev, k, self._width)
+        if changed and self._refv[k] == -1:
+            self.status = -1
+        else:
+            self.revealed_safe += len(changed)
+            self._check_win()
+        return changed
+
+    def _check_win(self):
+        """Win if every safe cell is revealed or every mine is flagged."""
+        if (self.revealed_safe == self.m * self.n - self.mines
+                or self.flags == self.mines_flagged == self.mines):
+            self.status = 1
+
+    def reveal(self, i, j):
+        """Reveal a cell, returning a list of cells that changed."""
+        if self.over or not self.in_bounds(i, j):
+            return []
+        if self.log is not None:
+            self.log.append((i, j, MOVE_REVEAL))
+        return [self._cell(k) for k in self._open(self._index(i, j))]
+
+    def flag(self, i, j):
+        """Toggle a flag on a hidden cell, returning cells that changed."""
+        if self.over or not self.in_bounds(i, j):
+            return []
+        if self.log is not None:
+            self.log.append((i, j, MOVE_FLAG))
+        k = self._index(i, j)
+        state = self._statev[k]
+        if state == STATE_REVEALED:
+            return []
+        mine = self._refv[k] == -1
+        if state == STATE_FLAGGED:
+            self._statev[k] = STATE_HIDDEN
+            self.flags -= 1
+            self.mines_flagged -= mine
+        else:
+            self._statev[k] = STATE_FLAGGED
+            self.flags += 1
+            self.mines_flagged += mine
+        self._check_win()
+        return [(i, j)]
+
+    def chord(self, i, j):
+        """Reveal unflagged neighbours of a number with all mines flagged."""
+        if self.over or not self.in_bounds(i, j):
+            return []
+        if self.log is not None:
+            self.log.append((i, j, MOVE_CHORD))
+        k = self._index(i, j)
+        if self._statev[k] != STATE_REVEALED or self._refv[k] <= 0:
+            return []
+        around = [k + o for o in offsets(self._width)]
+        flagged = sum(self._statev[nb] == STATE_FLAGGED for nb in around)
+        if flagged != self._refv[k]:
+            return []
+        changed = []
+        for nb in around:
+            if self._statev[nb] == STATE_HIDDEN and not self.over:
+                changed.extend(self._open(nb))
+        return [self._cell(c) for c in changed]
+
+    def cell(self, i, j):
+        """Code of a single cell in the player view."""
+        k = self._index(i, j)
+        state = self._statev[k]
+        if state == STATE_HIDDEN:
+            return HIDDEN
+        if state == STATE_FLAGGED:
+            return FLAG
+        value = self._refv[k]
+        return MINE if value == -1 else value
+
+    def view(self):
+        """Player view as an m x n grid of cell codes."""
+        state = self._state[1:-1, 1:-1]
+        grid = np.where(state == STATE_REVEALED, self.ref_grid, HIDDEN)
+        grid[grid == -1] = MINE
+        grid[state == STATE_FLAGGED] = FLAG
+        return grid.astype(np.uint8)
+
+    def player_grid(self):
+        """Player view as a grid of strings: "-", "F", "*" or counts."""
+        return SYMBOLS[self.view()]
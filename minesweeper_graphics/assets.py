@@ -0,0 +1,66 @@
+"""Sprite atlas and asset cache for minesweeper graphics."""
+from importlib import resources
+
+import pygame
+
+# sprite files in cell code order: counts 0-8, hidden, flag
+SPRITES = ["revealed.png", "one.png", "two.png", "three.png", "four.png",
+           "five.png", "six.png", "seven.png", "eight.png",
+           "unrevealed.png", "flag.png"]
+
+# decoded images are loaded once per process
+_atlas = None
+_rects = None
+_icon = None
+# sprites scaled to each cell size
+_scaled = {}
+
+
+def load_image(name):
+    """Decode an image shipped with the package."""
+    with resources.files(__package__).joinpath(name).open("rb") as f:
+        return pygame.image.load(f, name)
+
+
+def atlas():
+    """Return one surface holding every sprite and the rectangle of each."""
+    global _atlas, _rects
+    if _atlas is None:
+        images = [load_image(name) for name in SPRITES]
+        width = sum(image.get_width() for image in images)
+        height = max(image.get_height() for image in images)
+        _atlas = pygame.Surface((width, height))
+        _rects = []
+        # pack the sprites side by side
+        x = 0
+        for image in images:
+            _rects.append(_atlas.blit(image, (x, 0)))
+            x += image.get_width()
+    return _atlas, _rects
+
+
+def sprites(cell_size):
+    """Sprites scaled to cell_size, indexed by cell code (None for mine)."""
+    if cell_size not in _scaled:
+        source, rects = atlas()
+        # scaled atlas: one cell_size square per sprite
+        strip = pygame.Surface((cell_size * len(rects), cell_size))
+        for k, rect in enumerate(rects):
+            strip.blit(pygame.transform.scale(source.subsurface(rect),
+                                              (cell_size, cell_size)),
+                       (k * cell_size, 0))
+        # match the display format so blits take the fast path
+        if pygame.display.get_surface() is not None:
+            strip = strip.convert()
+        _scaled[cell_size] = [
+            strip.subsurface((k * cell_size, 0, cell_size, cell_size))
+            for k in range(0, len(rects))] + [None]
+    return _scaled[cell_size]
+
+
+def icon():
+    """Window icon."""
+    global _icon
+    if _icon is None:
+        _icon = load_image("icon.png")
+    return _icon
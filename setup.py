@@ -3,5 +3,7 @@ from setuptools import setup, find_packages
 setup(
     name="games",
     version="0.1",
-    packages=find_packages()
+    packages=find_packages(exclude=["benchmarks", "tests"]),
+    package_data={"minesweeper_graphics": ["*.png"]},
+    entry_points={"console_scripts": ["games = games.cli:main"]}
 )
@@ -0,0 +1,58 @@
+"""Tests for the vectorized board metrics against a breadth first search."""
+from collections import deque
+
+import numpy as np
+import pytest
+
+from minesweeper.analytics import analyse, metrics
+from minesweeper.board import create_references
+
+
+def bfs_metrics(ref_grid):
+    """3BV, openings and largest opening of one board, region by region."""
+    m, n = ref_grid.shape
+    seen = np.zeros((m, n), dtype=bool)
+    covered = np.zeros((m, n), dtype=bool)
+    openings = largest = 0
+    for x in range(0, m):
+        for y in range(0, n):
+            if ref_grid[x, y] != 0 or seen[x, y]:
+                continue
+            openings += 1
+            zeros = 0
+            seen[x, y] = True
+            queue = deque([(x, y)])
+            while queue:
+                i, j = queue.popleft()
+                covered[i, j] = True
+                zeros += 1
+                for a in range(max(i - 1, 0), min(i + 2, m)):
+                    for b in range(max(j - 1, 0), min(j + 2, n)):
+                        covered[a, b] = True
+                        if ref_grid[a, b] == 0 and not seen[a, b]:
+                            seen[a, b] = True
+                            queue.append((a, b))
+            largest = max(largest, zeros)
+    isolated = np.count_nonzero((ref_grid > 0) & ~covered)
+    return openings + isolated, openings, largest
+
+
+@pytest.mark.parametrize("m, n, k", [(9, 9, 10), (16, 30, 99),
+                                     (40, 50, 100), (30, 30, 0)])
+def test_metrics_match_bfs(m, n, k):
+    safe = (m // 2, n // 2)
+    ref_stack = create_references(200, m, n, k, rng=1, safe=safe,
+                                  opening=True)
+    assert (np.count_nonzero(ref_stack == -1, axis=(1, 2)) == k).all()
+    assert (ref_stack[:, safe[0], safe[1]] == 0).all()
+    values = metrics(ref_stack)
+    for b, ref_grid in enumerate(ref_stack):
+        expected = bfs_metrics(ref_grid)
+        assert (values["3bv"][b], values["openings"][b],
+                values["largest_opening"][b]) == expected
+
+
+def test_analyse_yields_each_batch_total():
+    out = list(analyse(9, 9, 10, 250, batch=100, seed=0, processes=1))
+    assert [h.boards for h in out] == [100, 200, 250]
+    assert out[0].counts["3bv"].sum() == 100
@@ -0,0 +1,61 @@
+"""Tests for the k in a row bitboard against a line scan."""
+import numpy as np
+import pytest
+
+from tictactoe.bitboard import Board, win_masks
+
+SIZES = [(3, 3, 3), (4, 4, 3), (5, 7, 4), (7, 5, 4), (6, 6, 5), (1, 5, 3),
+         (8, 8, 5)]
+
+
+def scan_lines(state, m, n, k):
+    """Players with a line of k, found by checking every line of the grid."""
+    grid = np.array(state).reshape(m, n)
+    players = set()
+    for i in range(0, m):
+        for j in range(0, n):
+            for di, dj in [(0, 1), (1, 0), (1, 1), (1, -1)]:
+                if not (0 <= i + di * (k - 1) < m
+                        and 0 <= j + dj * (k - 1) < n):
+                    continue
+                line = {grid[i + di * s, j + dj * s] for s in range(0, k)}
+                if len(line) == 1 and 0 not in line:
+                    players.add(int(line.pop()))
+    return players
+
+
+@pytest.mark.parametrize("m, n, k", SIZES)
+def test_winner_matches_scan(m, n, k):
+    rng = np.random.default_rng(m * 100 + n * 10 + k)
+    for _ in range(0, 500):
+        # any mix of squares, including both players with lines
+        state = rng.choice([-1, 0, 1], m * n, p=[0.4, 0.2, 0.4]).tolist()
+        lines = scan_lines(state, m, n, k)
+        expected = 1 if 1 in lines else -1 if -1 in lines else 0
+        assert Board.from_state(state, m, n, k).winner() == expected
+
+
+@pytest.mark.parametrize("m, n, k", SIZES)
+def test_last_move_won_matches_scan(m, n, k):
+    rng = np.random.default_rng(m * 100 + n * 10 + k)
+    for _ in range(0, 200):
+        board = Board(m, n, k)
+        for move in rng.permutation(m * n).tolist():
+            board.play(move)
+            # no line existed before this move, so any line is the mover's
+            won = bool(scan_lines(board.to_state(), m, n, k))
+            assert board.last_move_won() == won
+            if won:
+                assert board.winner() == -board.to_move()
+                break
+        # undo takes the board back to empty
+        while board.moves:
+            board.undo()
+        assert board.masks == [0, 0] and board.side == 0
+
+
+def test_masks_count_lines():
+    for m, n, k in SIZES + [(15, 15, 5)]:
+        expected = (m * max(n - k + 1, 0) + n * max(m - k + 1, 0)
+                    + 2 * max(m - k + 1, 0) * max(n - k + 1, 0))
+        assert len(win_masks(m, n, k)[0]) == expected
@@ -0,0 +1,58 @@
+"""Tests for compact board files."""
+import numpy as np
+import pytest
+
+from minesweeper.board import create_reference, create_references
+from minesweeper.boardfile import BoardFile, BoardWriter, generate
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / "boards.msb"
+    ref_stack = create_references(10, 16, 30, 99, rng=0)
+    with BoardWriter(path, 16, 30) as writer:
+        writer.write(ref_stack[:3], seeds=[1, 2, 3])
+        writer.write(ref_stack[3])
+    with BoardWriter(path, 16, 30) as writer:
+        writer.write(ref_stack[4:] == -1)
+    with BoardFile(path) as boards:
+        assert len(boards) == 10
+        assert (boards[:] == ref_stack).all()
+        assert (boards[5] == ref_stack[5]).all()
+        assert (np.array(list(boards)) == ref_stack).all()
+        assert boards.seeds().tolist() == [1, 2, 3] + [0] * 7
+        assert (boards.mine_counts() == 99).all()
+
+
+def test_partial_record_is_replaced(tmp_path):
+    path = tmp_path / "boards.msb"
+    ref_stack = create_references(3, 9, 9, 10, rng=1)
+    with BoardWriter(path, 9, 9) as writer:
+        writer.write(ref_stack[:2])
+    # an interrupted writer leaves part of a record
+    with open(path, "ab") as f:
+        f.write(b"\x01" * 5)
+    with BoardFile(path) as boards:
+        assert len(boards) == 2
+    with BoardWriter(path, 9, 9) as writer:
+        writer.write(ref_stack[2])
+    with BoardFile(path) as boards:
+        assert len(boards) == 3
+        assert boards.mine_counts().tolist() == [10, 10, 10]
+        assert (boards[:] == ref_stack).all()
+
+
+def test_size_mismatch(tmp_path):
+    path = tmp_path / "boards.msb"
+    with BoardWriter(path, 9, 9) as writer:
+        writer.write(create_reference(9, 9, 10, rng=0))
+    with pytest.raises(ValueError):
+        BoardWriter(path, 16, 16)
+
+
+def test_generate_seeds_rebuild_boards(tmp_path):
+    path = tmp_path / "boards.msb"
+    generate(path, 9, 9, 10, 20, seed=4, safe=(4, 4), opening=True, batch=8)
+    with BoardFile(path) as boards:
+        for seed, ref_grid in zip(boards.seeds(), boards):
+            assert (create_reference(9, 9, 10, int(seed), (4, 4), True)
+                    == ref_grid).all()
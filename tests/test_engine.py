@@ -0,0 +1,33 @@
+"""Tests for the tic tac toe lookup table cache."""
+import numpy as np
+import pytest
+
+from tictactoe import engine
+
+
+@pytest.fixture
+def fresh(monkeypatch):
+    """Forget tables loaded by earlier tests."""
+    monkeypatch.setattr(engine, "_best", None)
+    monkeypatch.setattr(engine, "_value", None)
+
+
+def test_truncated_cache_is_rebuilt(tmp_path, fresh):
+    path = str(tmp_path / "tictactoe.npz")
+    with open(path, "wb") as f:
+        f.write(b"PK\x03\x04truncated")
+    best, value = engine.load(path)
+    assert best.shape == (3 ** 9,)
+    assert engine.best_move([0] * 9) >= 0
+    # the rebuilt tables replaced the broken file
+    with np.load(path) as data:
+        assert (data["best"] == best).all()
+
+
+def test_wrong_shape_cache_is_rebuilt(tmp_path, fresh):
+    path = str(tmp_path / "tictactoe.npz")
+    np.savez(path, best=np.zeros(5, dtype=np.int8),
+             value=np.zeros(5, dtype=np.int8))
+    best, value = engine.load(path)
+    assert best.shape == value.shape == (3 ** 9,)
+    assert list(tmp_path.iterdir()) == [tmp_path / "tictactoe.npz"]
@@ -0,0 +1,99 @@
+"""Tests for chunked boards against a full Board with the same mines."""
+import random
+
+import numpy as np
+import pytest
+
+from minesweeper.board import reference_from_mines
+from minesweeper.infinite import InfiniteBoard, chunk_mines
+from minesweeper.state import HIDDEN, Board
+
+M, N, SIZE = 64, 80, 16
+SAFE = (5, 7)
+
+
+def boards(seed, density):
+    """Chunked board with a tiny cache and the equivalent full Board."""
+    chunked = InfiniteBoard(seed, density, M, N, SAFE, SIZE, cache_size=3)
+    mines = np.block([[chunk_mines(seed, ci, cj, SIZE, density, M, N, SAFE)
+                       for cj in range(0, N // SIZE)]
+                      for ci in range(0, M // SIZE)])
+    return chunked, Board(reference_from_mines(mines))
+
+
+def apply(chunked, full, action, i, j):
+    changed = getattr(chunked, action)(i, j)
+    expected = getattr(full, action)(i, j)
+    assert set(changed) == set(expected), (action, i, j)
+    assert chunked.status == full.status or full.won
+
+
+def check_same(chunked, full):
+    assert (chunked.view(0, 0, M, N) == full.view()).all()
+    assert chunked.revealed_safe == full.revealed_safe
+    assert chunked.flags == full.flags
+
+
+@pytest.mark.parametrize("seed, density", [(0, 0.05), (1, 0.1), (2, 0.16),
+                                           (3, 0.2), (4, 0.1)])
+def test_random_moves_match_full_board(seed, density):
+    chunked, full = boards(seed, density)
+    rng = random.Random(seed)
+    apply(chunked, full, "reveal", *SAFE)
+    for _ in range(0, 400):
+        if full.over:
+            break
+        action = rng.choice(["reveal", "reveal", "flag", "chord"])
+        apply(chunked, full, action, rng.randrange(M), rng.randrange(N))
+    check_same(chunked, full)
+    chunked.close()
+
+
+def edge_numbers(full, hidden):
+    """Numbered cells on chunk edges, hidden or revealed."""
+    view = full.view()
+    for i in range(0, M):
+        for j in range(0, N):
+            edge = i % SIZE in (0, SIZE - 1) or j % SIZE in (0, SIZE - 1)
+            number = full.ref_grid[i, j] > 0
+            if edge and number and (view[i, j] == HIDDEN) == hidden:
+                yield i, j
+
+
+@pytest.mark.parametrize("seed", [4, 5, 6])
+def test_flagged_edge_numbers_stay_closed(seed):
+    chunked, full = boards(seed, 0.12)
+    apply(chunked, full, "reveal", *SAFE)
+    for i, j in list(edge_numbers(full, hidden=True)):
+        apply(chunked, full, "flag", i, j)
+        apply(chunked, full, "reveal", i, j)
+        apply(chunked, full, "chord", i, j)
+        apply(chunked, full, "flag", i, j)
+    check_same(chunked, full)
+    chunked.close()
+
+
+@pytest.mark.parametrize("seed", [4, 5, 6])
+def test_revealed_edge_numbers_change_nothing(seed):
+    chunked, full = boards(seed, 0.12)
+    apply(chunked, full, "reveal", *SAFE)
+    for i, j in list(edge_numbers(full, hidden=False)):
+        apply(chunked, full, "reveal", i, j)
+        apply(chunked, full, "flag", i, j)
+    check_same(chunked, full)
+    chunked.close()
+
+
+@pytest.mark.parametrize("m, n", [(None, None), (None, 100),
+                                  (10 ** 6, 10 ** 6)])
+def test_percolating_density_rejected(m, n):
+    with pytest.raises(ValueError):
+        InfiniteBoard(1, 0.05, m, n)
+
+
+def test_default_density_unbounded():
+    board = InfiniteBoard(1)
+    try:
+        assert board.reveal(0, 0)
+    finally:
+        board.close()
@@ -0,0 +1,53 @@
+"""Tests for vectorized mastermind scoring against check."""
+import numpy as np
+import pytest
+
+from mastermind.mastermind import check, check_many
+
+
+@pytest.mark.parametrize("cmp, ln", [(6, 4), (2, 5), (8, 6), (3, 1)])
+def test_check_many_matches_check(cmp, ln):
+    rng = np.random.default_rng(cmp * ln)
+    # few colours make repeated colours, the hard case for yellows, common
+    guesses = rng.integers(1, cmp + 1, (5000, ln))
+    answers = rng.integers(1, cmp + 1, (5000, ln))
+    greens, yellows, result = check_many(guesses, answers, positional=True)
+    for k in range(0, len(guesses)):
+        expected = check(guesses[k].tolist(), answers[k].tolist(), ln)
+        assert result[k].tolist() == expected
+        assert greens[k] == expected.count("G")
+        assert yellows[k] == expected.count("Y")
+
+
+def test_check_many_duplicate_colours():
+    cases = [([1, 1, 2, 2], [2, 2, 1, 1]), ([1, 1, 1, 2], [1, 2, 2, 2]),
+             ([2, 1, 1, 1], [1, 2, 3, 4]), ([1, 2, 1, 2], [1, 1, 1, 1])]
+    guesses, answers = np.array(cases).transpose(1, 0, 2)
+    greens, yellows, result = check_many(guesses, answers, positional=True)
+    for (guess, answer), row in zip(cases, result):
+        assert row.tolist() == check(guess, answer)
+
+
+def test_check_many_broadcasts_every_pair():
+    rng = np.random.default_rng(0)
+    guesses = rng.integers(1, 7, (20, 4))
+    answers = rng.integers(1, 7, (30, 4))
+    greens, yellows = check_many(guesses[:, None], answers[None, :])
+    assert greens.shape == (20, 30)
+    for i in range(0, 20):
+        for j in range(0, 30):
+            expected = check(guesses[i].tolist(), answers[j].tolist())
+            assert (greens[i, j], yellows[i, j]) == (expected.count("G"),
+                                                     expected.count("Y"))
+
+
+def test_table_strategies_refuse_large_games():
+    from mastermind.simulate import play, simulate
+    with pytest.raises(ValueError):
+        next(simulate(("first", "minimax"), games=1, cmp=8, ln=6))
+    with pytest.raises(ValueError):
+        play([1] * 6, 8, 6, "expected")
+    with pytest.raises(ValueError):
+        play([1] * 4, 6, 4, "unknown")
+    guesses, times = play([1, 2, 3, 4], 6, 4, "minimax")
+    assert guesses <= 5
@@ -0,0 +1,19 @@
+"""Tests for the root parallel tree search."""
+import numpy as np
+
+from tictactoe import mcts
+
+
+def test_search_worker_counts_only_its_own_visits(monkeypatch):
+    # two jobs of one parallel search landing on the same worker
+    monkeypatch.setattr(mcts, "_worker", None)
+    seeds = np.random.SeedSequence(0).spawn(2)
+    for seed in seeds:
+        visits, rollouts = mcts._search_worker(
+            (5, 5, 4, [12], 16, 1.4, seed, 50, None))
+        assert rollouts == 50 * 16
+        assert sum(visits.values()) == rollouts
+    # a later move reuses the tree but still reports only its own search
+    visits, rollouts = mcts._search_worker(
+        (5, 5, 4, [12, 6], 16, 1.4, seeds[0], 30, None))
+    assert sum(visits.values()) == rollouts == 30 * 16
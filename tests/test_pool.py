@@ -0,0 +1,26 @@
+"""Tests for the ordered process pool map."""
+from itertools import count, islice, repeat
+import time
+
+import pytest
+
+from games.pool import ordered_map
+
+
+@pytest.mark.parametrize("processes, window", [(1, None), (2, None), (3, 1)])
+def test_ordered_map_keeps_order(processes, window):
+    jobs = range(0, 50)
+    assert list(ordered_map(abs, (-j for j in jobs), processes,
+                            window)) == list(jobs)
+
+
+def test_ordered_map_endless_jobs():
+    assert list(islice(ordered_map(abs, count(), 2), 10)) == list(range(10))
+
+
+def test_ordered_map_close_does_not_wait():
+    results = ordered_map(time.sleep, repeat(0.2), 2, window=40)
+    next(results)
+    start = time.perf_counter()
+    results.close()
+    assert time.perf_counter() - start < 1
@@ -0,0 +1,62 @@
+"""Tests for minesweeper replay logs."""
+import numpy as np
+import pytest
+
+from minesweeper import replay
+
+
+def play_game(seed, rng):
+    """Record a game of random moves, returning the recording and board."""
+    board, recording = replay.record(16, 30, 99, seed, safe=(8, 15),
+                                     opening=bool(seed % 2))
+    board.reveal(8, 15)
+    while not board.over and len(recording.moves) < 200:
+        i, j = int(rng.integers(16)), int(rng.integers(30))
+        [board.reveal, board.flag, board.chord][rng.integers(3)](i, j)
+    return recording, board
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / "games.msr"
+    rng = np.random.default_rng(0)
+    games = [play_game(seed, rng) for seed in range(0, 6)]
+    # the board of an unstarted game has no moves
+    games.append((replay.Recording(9, 9, 10, seed=3), None))
+    replay.append(path, [recording for recording, board in games[:3]])
+    replay.append(path, [recording for recording, board in games[3:]])
+    recordings = list(replay.read(path))
+    assert len(recordings) == len(games)
+    for (recording, board), read in zip(games, recordings):
+        assert (read.m, read.n, read.mines, read.seed, read.safe,
+                read.opening) == (recording.m, recording.n, recording.mines,
+                                  recording.seed, recording.safe,
+                                  recording.opening)
+        assert [tuple(move) for move in read.moves.tolist()] == \
+            recording.moves
+        replayed = replay.replay(read)
+        if board is not None:
+            assert (replayed.view() == board.view()).all()
+            assert replayed.status == board.status
+    assert list(replay.replay_file(path))[:6] == [
+        (board.status, board.revealed_safe, board.flags)
+        for recording, board in games[:6]]
+
+
+@pytest.mark.parametrize("cut", [1, 10, replay.HEADER.itemsize + 3])
+def test_partial_record(tmp_path, cut):
+    path = tmp_path / "games.msr"
+    recording, board = play_game(1, np.random.default_rng(1))
+    replay.append(path, [recording, recording])
+    with open(path, "r+b") as f:
+        f.truncate(f.seek(0, 2) - len(recording.to_bytes()) + cut)
+    records = replay.read(path)
+    assert next(records).seed == 1
+    with pytest.raises(ValueError, match="partial record"):
+        next(records)
+
+
+def test_not_a_log(tmp_path):
+    path = tmp_path / "games.msr"
+    path.write_bytes(b"MSBF1" + bytes(40))
+    with pytest.raises(ValueError):
+        list(replay.read(path))
@@ -0,0 +1,64 @@
+"""Tests for the reveal cascade against the original recursive method."""
+import numpy as np
+import pytest
+
+from minesweeper.board import create_reference
+from minesweeper.reveal import reveal
+
+
+def zero_method(ref_grid, x, y):
+    """The original recursive search: connected zeros and their border."""
+    m, n = ref_grid.shape
+    zeros = set()
+    border = set()
+
+    def f(x, y):
+        for i in range(max(x - 1, 0), min(x + 2, m)):
+            for j in range(max(y - 1, 0), min(y + 2, n)):
+                pos = (i, j)
+                if pos == (x, y):
+                    continue
+                if ref_grid[pos] == 0 and pos not in zeros:
+                    zeros.add(pos)
+                    f(i, j)
+                elif pos not in border:
+                    border.add(pos)
+    f(x, y)
+    # the original missed (x, y) itself when no other zero touched it
+    return zeros | border | {(x, y)}
+
+
+def original_reveal(ref_grid, x, y):
+    """Cells the original player_move showed for a click on (x, y)."""
+    m, n = ref_grid.shape
+    cells = {(x, y)}
+    if ref_grid[x, y] == -1:
+        return cells
+    if ref_grid[x, y] == 0:
+        return cells | zero_method(ref_grid, x, y)
+    # a number also opens the zero regions it touches
+    for i in range(max(x - 1, 0), min(x + 2, m)):
+        for j in range(max(y - 1, 0), min(y + 2, n)):
+            if ref_grid[i, j] == 0:
+                cells |= zero_method(ref_grid, i, j)
+    return cells
+
+
+@pytest.mark.parametrize("m, n, mines", [(9, 9, 10), (16, 30, 99),
+                                         (20, 20, 20), (12, 7, 0)])
+def test_reveal_matches_original(m, n, mines):
+    ref_grid = create_reference(m, n, mines, rng=m * n + mines)
+    for x in range(0, m):
+        for y in range(0, n):
+            assert reveal(ref_grid, x, y) == original_reveal(ref_grid, x, y)
+
+
+def test_reveal_skips_and_updates_revealed():
+    ref_grid = create_reference(16, 30, 40, rng=3)
+    revealed = np.zeros(ref_grid.shape, dtype=bool)
+    seen = set()
+    for x, y in [(0, 0), (8, 15), (15, 29), (8, 15)]:
+        cells = reveal(ref_grid, x, y, revealed)
+        assert not cells & seen
+        seen |= cells
+    assert seen == set(zip(*np.nonzero(revealed)))
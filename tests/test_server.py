@@ -0,0 +1,80 @@
+"""Tests for the asyncio game server."""
+import asyncio
+import json
+
+from games.server import Server
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_non_object_requests_are_rejected():
+    server = Server()
+    for request in ([1, 2], 5, "cmd", None):
+        response = run(server.dispatch(request))
+        assert response["ok"] is False
+
+
+def test_bad_arguments_are_rejected():
+    server = Server()
+    response = run(server.dispatch({"cmd": "new", "game": "tictactoe",
+                                    "args": [1]}))
+    assert response["ok"] is False
+    session = run(server.dispatch({"cmd": "new", "game": "tictactoe",
+                                   "args": {}}))["session"]
+    response = run(server.dispatch({"cmd": "move", "session": session,
+                                    "args": "4"}))
+    assert response["ok"] is False
+
+
+def test_unexpected_errors_become_responses(monkeypatch):
+    server = Server()
+    session = run(server.dispatch({"cmd": "new", "game": "tictactoe",
+                                   "args": {}}))["session"]
+
+    async def broken(*args):
+        raise RuntimeError("boom")
+    monkeypatch.setattr(type(server.sessions[session]), "cmd_move", broken)
+    response = run(server.dispatch({"cmd": "move", "session": session,
+                                    "args": [4]}))
+    assert response == {"ok": False, "error": "Internal error"}
+
+
+def test_connection_survives_bad_requests():
+    async def session():
+        server = Server()
+        listener = await asyncio.start_server(server.handle, "127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        responses = []
+        for line in (b"[1,2]\n", b"5\n", b"not json\n",
+                     b'{"cmd": "stats"}\n'):
+            writer.write(line)
+            await writer.drain()
+            responses.append(json.loads(await reader.readline()))
+        writer.close()
+        listener.close()
+        await listener.wait_closed()
+        return responses
+    responses = run(session())
+    assert [r["ok"] for r in responses] == [False, False, False, True]
+
+
+def test_large_mastermind_hint_avoids_the_feedback_table():
+    from games.server import _mastermind_hint
+    from mastermind import solver
+    from mastermind.mastermind import check
+
+    answer = [3, 1, 4, 1, 5, 2, 6]
+    history = []
+    for _ in range(0, 3):
+        guess = _mastermind_hint(7, 7, history)
+        history.append((guess, check(guess, answer, 7)))
+    assert (7, 7) not in solver._tables
+    # every hint could be the answer given the results before it
+    for k, (hint, _) in enumerate(history):
+        for guess, result in history[:k]:
+            feedback = check(guess, hint, 7)
+            assert feedback.count("G") == result.count("G")
+            assert feedback.count("Y") == result.count("Y")
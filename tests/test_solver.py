@@ -0,0 +1,50 @@
+"""Tests for the minesweeper constraint solver against enumeration."""
+from itertools import combinations
+
+import numpy as np
+import pytest
+
+from minesweeper.board import create_reference
+from minesweeper.solver import solve
+from minesweeper.state import HIDDEN, Board
+
+
+def enumerate_probabilities(view, mines):
+    """Mine probability of each hidden cell over every consistent layout."""
+    m, n = view.shape
+    hidden = list(zip(*np.nonzero(view == HIDDEN)))
+    numbers = [(i, j, int(view[i, j])) for i, j in zip(*np.nonzero(view < 9))]
+    hits = np.zeros((m, n))
+    total = 0
+    for layout in combinations(hidden, mines):
+        grid = np.zeros((m + 2, n + 2), dtype=int)
+        for i, j in layout:
+            grid[i + 1, j + 1] = 1
+        if all(grid[i:i + 3, j:j + 3].sum() == value
+               for i, j, value in numbers):
+            total += 1
+            for i, j in layout:
+                hits[i, j] += 1
+    probs = np.full((m, n), np.nan)
+    for cell in hidden:
+        probs[cell] = hits[cell] / total
+    return probs
+
+
+@pytest.mark.parametrize("seed", range(0, 12))
+def test_solve_matches_enumeration(seed):
+    rng = np.random.default_rng(seed)
+    mines = 3 + seed % 4
+    board = Board(create_reference(4, 5, mines, rng, safe=(0, 0)))
+    board.reveal(0, 0)
+    # open a few more safe cells to vary the frontier
+    for _ in range(0, seed % 3):
+        safe = np.argwhere((board.view() == HIDDEN) & (board.ref_grid >= 0))
+        if len(safe):
+            board.reveal(*safe[rng.integers(len(safe))])
+    view = board.view()
+    expected = enumerate_probabilities(view, mines)
+    safe, known, probs = solve(view, mines)
+    assert np.allclose(probs, expected, equal_nan=True)
+    assert safe == {tuple(c) for c in np.argwhere(expected == 0)}
+    assert known == {tuple(c) for c in np.argwhere(expected == 1)}
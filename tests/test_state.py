@@ -0,0 +1,114 @@
+"""Tests for the headless minesweeper board."""
+import numpy as np
+
+from minesweeper.board import reference_from_mines
+from minesweeper.state import FLAG, HIDDEN, MINE, Board
+
+# 4 x 6 board whose left part has no zeros, so numbers there open alone,
+# and whose right columns hold zeros
+MINES = np.zeros((4, 6), dtype=bool)
+MINES[[0, 0, 2, 3], [0, 2, 0, 3]] = True
+CORRECT = [(0, 0), (0, 2), (2, 0)]
+
+
+def board():
+    return Board(reference_from_mines(MINES))
+
+
+def test_reveal_all_safe_cells_wins():
+    b = board()
+    b.reveal(0, 5)
+    assert not b.over
+    for i, j in zip(*np.nonzero(~MINES)):
+        b.reveal(i, j)
+    assert b.won and not b.lost
+    assert b.revealed_safe == MINES.size - 4
+    assert b.reveal(0, 0) == [] and b.won
+
+
+def test_flag_all_mines_wins():
+    b = board()
+    for cell in CORRECT:
+        b.flag(*cell)
+    assert not b.over
+    b.flag(3, 3)
+    assert b.won
+    assert b.flags == b.mines_flagged == 4
+
+
+def test_wrong_flag_blocks_flag_win():
+    b = board()
+    for cell in [(1, 3)] + CORRECT + [(3, 3)]:
+        b.flag(*cell)
+    assert not b.over
+    # removing the wrong flag completes the win
+    assert b.flag(1, 3) == [(1, 3)]
+    assert b.won
+
+
+def test_flag_toggles():
+    b = board()
+    assert b.flag(2, 2) == [(2, 2)]
+    assert b.cell(2, 2) == FLAG and b.flags == 1
+    # flagged cells are not revealed
+    assert b.reveal(2, 2) == []
+    assert b.flag(2, 2) == [(2, 2)]
+    assert b.cell(2, 2) == HIDDEN and b.flags == 0
+    # revealed cells cannot be flagged
+    b.reveal(1, 1)
+    assert b.flag(1, 1) == [] and b.flags == 0
+
+
+def test_chord_with_correct_flags():
+    b = board()
+    assert b.reveal(1, 1) == [(1, 1)]
+    assert b.cell(1, 1) == 3
+    for cell in CORRECT:
+        b.flag(*cell)
+    changed = b.chord(1, 1)
+    assert sorted(changed) == [(0, 1), (1, 0), (1, 2), (2, 1), (2, 2)]
+    assert not b.over
+    assert all(b.cell(*cell) == FLAG for cell in CORRECT)
+
+
+def test_chord_with_wrong_flags():
+    b = board()
+    b.reveal(1, 1)
+    # too few flags does nothing
+    assert b.chord(1, 1) == []
+    # the right count in the wrong place sets off the mine
+    for cell in [(0, 0), (0, 1), (0, 2)]:
+        b.flag(*cell)
+    b.chord(1, 1)
+    assert b.lost
+    assert b.cell(2, 0) == MINE
+
+
+def test_chord_needs_a_revealed_number():
+    b = board()
+    assert b.chord(1, 1) == []
+    b.reveal(0, 5)
+    assert b.cell(0, 5) == 0
+    assert b.chord(0, 5) == []
+
+
+def test_no_moves_after_loss():
+    b = board()
+    assert b.reveal(0, 0) == [(0, 0)]
+    assert b.lost
+    assert b.reveal(0, 5) == []
+    assert b.flag(2, 2) == []
+    assert b.chord(1, 1) == []
+    assert b.cell(0, 5) == HIDDEN
+
+
+def test_off_board_moves_ignored():
+    b = board()
+    b.log = []
+    for i, j in [(-1, 0), (0, -1), (4, 0), (0, 6)]:
+        assert b.reveal(i, j) == []
+        assert b.flag(i, j) == []
+        assert b.chord(i, j) == []
+    assert b.log == []
+    assert (b.view() == HIDDEN).all()
+    assert b.flags == b.revealed_safe == 0 and not b.over
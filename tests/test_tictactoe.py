@@ -0,0 +1,24 @@
+"""Tests for the terminal tic tac toe game."""
+from tictactoe.tictactoe import game
+
+
+def play(monkeypatch, capsys, answers, computer=None):
+    answers = iter(answers)
+    monkeypatch.setattr("builtins.input", lambda prompt: next(answers))
+    game(computer)
+    return capsys.readouterr().out
+
+
+def test_taken_and_off_board_squares_asked_again(monkeypatch, capsys):
+    # p1 wins down the left column after retries
+    out = play(monkeypatch, capsys,
+               ["0", "0", "9", "x", "1", "3", "3", "2", "6"])
+    assert out.count("Choose an empty square") == 4
+    assert "p1 wins" in out
+
+
+def test_taken_square_against_engine(monkeypatch, capsys):
+    answers = ["4", "4"] + [str(s) for s in range(0, 9)] * 9
+    out = play(monkeypatch, capsys, answers, computer=-1)
+    assert "Choose an empty square" in out
+    assert "p1 wins" not in out
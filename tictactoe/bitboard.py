@@ -0,0 +1,153 @@
+"""Bitboard state for k in a row games on an m x n board."""
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def win_masks(m=3, n=3, k=3):
+    """Every line of k squares as a bit mask, square i * n + j is bit i * n + j.
+
+    Returns the tuple of all masks and, for each square, the tuple of masks
+    through it.
+    """
+    masks = []
+    for i in range(0, m):
+        for j in range(0, n):
+            # right, down, down-right and down-left from (i, j)
+            for di, dj in [(0, 1), (1, 0), (1, 1), (1, -1)]:
+                end_i = i + di * (k - 1)
+                end_j = j + dj * (k - 1)
+                if 0 <= end_i < m and 0 <= end_j < n:
+                    mask = 0
+                    for step in range(0, k):
+                        mask |= 1 << ((i + di * step) * n + j + dj * step)
+                    masks.append(mask)
+    through = tuple(tuple(mask for mask in masks if mask >> square & 1)
+                    for square in range(0, m * n))
+    return tuple(masks), through
+
+
+@lru_cache(maxsize=None)
+def shift_masks(m=3, n=3, k=3):
+    """(shift, starts) for each direction of a line.
+
+    starts has a bit for every square where a line of k squares in that
+    direction fits, so shifting a player's mask k - 1 times and AND-ing
+    finds lines without any wrap around the board edge.
+    """
+    result = []
+    for di, dj, shift in [(0, 1, 1), (1, 0, n), (1, 1, n + 1), (1, -1, n - 1)]:
+        starts = 0
+        for i in range(0, m):
+            for j in range(0, n):
+                end_i = i + di * (k - 1)
+                end_j = j + dj * (k - 1)
+                if 0 <= end_i < m and 0 <= end_j < n:
+                    starts |= 1 << (i * n + j)
+        if starts:
+            result.append((shift, starts))
+    return tuple(result)
+
+
+def has_line(bits, shifts, k):
+    """Check if a player's bit mask holds a line of k."""
+    for shift, starts in shifts:
+        line = bits & starts
+        for step in range(1, k):
+            line &= bits >> (step * shift)
+            if not line:
+                break
+        if line:
+            return True
+    return False
+
+
+class Board():
+    """Two bit masks, one per player, with make/unmake moves."""
+
+    __slots__ = ("m", "n", "k", "masks", "side", "moves", "full", "lines",
+                 "shifts")
+
+    def __init__(self, m=3, n=3, k=3):
+        self.m = m
+        self.n = n
+        self.k = k
+        # masks[0] holds p1 (1, X) and masks[1] holds p2 (-1, O)
+        self.masks = [0, 0]
+        # index of the player to move
+        self.side = 0
+        self.moves = []
+        self.full = (1 << (m * n)) - 1
+        self.lines = win_masks(m, n, k)[1]
+        self.shifts = shift_masks(m, n, k)
+
+    @classmethod
+    def from_state(cls, state, m=3, n=3, k=3):
+        """Board from a list of 1, -1 and 0 squares, e.g. a tictactoe state.
+
+        The move history is not known, so moves cannot be undone past it.
+        """
+        board = cls(m, n, k)
+        for square, x in enumerate(state):
+            if x == 1:
+                board.masks[0] |= 1 << square
+            elif x == -1:
+                board.masks[1] |= 1 << square
+        p1 = bin(board.masks[0]).count("1")
+        p2 = bin(board.masks[1]).count("1")
+        board.side = 0 if p1 == p2 else 1
+        return board
+
+    def to_state(self):
+        """List of 1, -1 and 0 squares."""
+        return [1 if self.masks[0] >> s & 1 else -1 if self.masks[1] >> s & 1
+                else 0 for s in range(0, self.m * self.n)]
+
+    def to_move(self):
+        """Player to move: 1 (X) moves first."""
+        return 1 if self.side == 0 else -1
+
+    def empty(self):
+        """Bit mask of empty squares."""
+        return self.full & ~(self.masks[0] | self.masks[1])
+
+    def legal_moves(self):
+        """List of empty squares."""
+        empty = self.empty()
+        return [s for s in range(0, self.m * self.n) if empty >> s & 1]
+
+    def play(self, square):
+        """Play square for the player to move (no copying)."""
+        self.masks[self.side] |= 1 << square
+        self.moves.append(square)
+        self.side ^= 1
+
+    def undo(self):
+        """Take back the last move."""
+        self.side ^= 1
+        self.masks[self.side] &= ~(1 << self.moves.pop())
+
+    def wins(self, side, square):
+        """Check if side has a line through square."""
+        bits = self.masks[side]
+        for mask in self.lines[square]:
+            if bits & mask == mask:
+                return True
+        return False
+
+    def last_move_won(self):
+        """Check if the last move played made a line."""
+        if not self.moves:
+            return False
+        return self.wins(self.side ^ 1, self.moves[-1])
+
+    def winner(self):
+        """Return 1 or -1 if that player has a line, otherwise 0."""
+        if has_line(self.masks[0], self.shifts, self.k):
+            return 1
+        if has_line(self.masks[1], self.shifts, self.k):
+            return -1
+        return 0
+
+    def is_full(self):
+        """Check if no squares are left."""
+        return self.masks[0] | self.masks[1] == self.full
@@ -0,0 +1,193 @@
+"""Perfect play tic tac toe engine."""
+import os
+import tempfile
+import time
+import zipfile
+
+import numpy as np
+
+from tictactoe.rules import winner
+
+# the 8 symmetries of the board as permutations of the squares
+_ROTATE = [6, 3, 0, 7, 4, 1, 8, 5, 2]
+_REFLECT = [2, 1, 0, 5, 4, 3, 8, 7, 6]
+SYMMETRIES = [list(range(0, 9))]
+for _ in range(0, 3):
+    SYMMETRIES.append([SYMMETRIES[-1][i] for i in _ROTATE])
+SYMMETRIES += [[sym[i] for i in _REFLECT] for sym in SYMMETRIES]
+
+# on disk cache of the lookup tables
+CACHE = os.path.join(os.path.expanduser("~"), ".cache", "games",
+                     "tictactoe.npz")
+
+# bound flags for transposition table entries
+EXACT = 0
+LOWER = 1
+UPPER = 2
+
+# best move and value of every position, indexed by key
+_best = None
+_value = None
+# seconds taken to build the tables, None if loaded from disk
+build_time = None
+
+
+def key(state):
+    """Base 3 integer for a state, with -1 stored as 2."""
+    k = 0
+    for x in state:
+        k = k * 3 + x % 3
+    return k
+
+
+def canonical(state):
+    """Smallest key of the state under the 8 symmetries."""
+    return min(key([state[i] for i in sym]) for sym in SYMMETRIES)
+
+
+def to_move(state):
+    """Player to move: 1 (X) moves first."""
+    return 1 if state.count(1) == state.count(-1) else -1
+
+
+def negamax(state, player, alpha, beta, table):
+    """Value of state for player to move with alpha-beta search.
+
+    A win scores one more than the empty squares left, so faster wins score
+    higher, and a draw scores 0. table maps canonical keys to (flag, value)
+    and is shared between searches.
+    """
+    if winner(state) != 0:
+        # the previous player just won
+        return -(state.count(0) + 1)
+    if 0 not in state:
+        return 0
+    k = canonical(state)
+    start = alpha
+    if k in table:
+        flag, value = table[k]
+        if flag == EXACT:
+            return value
+        if flag == LOWER:
+            alpha = max(alpha, value)
+        else:
+            beta = min(beta, value)
+        if alpha >= beta:
+            return value
+    best = -100
+    for i in range(0, 9):
+        if state[i] == 0:
+            state[i] = player
+            value = -negamax(state, -player, -beta, -alpha, table)
+            state[i] = 0
+            best = max(best, value)
+            alpha = max(alpha, value)
+            if alpha >= beta:
+                break
+    if best <= start:
+        table[k] = (UPPER, best)
+    elif best >= beta:
+        table[k] = (LOWER, best)
+    else:
+        table[k] = (EXACT, best)
+    return best
+
+
+def search(state, table=None):
+    """Return (best square, value) for the player to move."""
+    if table is None:
+        table = {}
+    player = to_move(state)
+    state = list(state)
+    best, move = -100, None
+    for i in range(0, 9):
+        if state[i] == 0:
+            state[i] = player
+            value = -negamax(state, -player, -100, 100, table)
+            state[i] = 0
+            if value > best:
+                best, move = value, i
+    return move, best
+
+
+def build():
+    """Search every reachable position, returning best move and value arrays.
+
+    Unreachable and finished positions have best move -1.
+    """
+    best = np.full(3 ** 9, -1, dtype=np.int8)
+    value = np.zeros(3 ** 9, dtype=np.int8)
+    table = {}
+    seen = set()
+    stack = [[0] * 9]
+    while stack:
+        state = stack.pop()
+        k = key(state)
+        if k in seen:
+            continue
+        seen.add(k)
+        if winner(state) != 0 or 0 not in state:
+            continue
+        best[k], value[k] = search(state, table)
+        player = to_move(state)
+        for i in range(0, 9):
+            if state[i] == 0:
+                child = list(state)
+                child[i] = player
+                stack.append(child)
+    return best, value
+
+
+def load(path=CACHE):
+    """Load the lookup tables, building and caching them on first use."""
+    global _best, _value, build_time
+    if _best is not None:
+        return _best, _value
+    try:
+        with np.load(path) as data:
+            best, value = data["best"], data["value"]
+        if best.shape != (3 ** 9,) or value.shape != (3 ** 9,):
+            raise ValueError(f"{path} holds tables of the wrong shape")
+        _best, _value = best, value
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+        start = time.perf_counter()
+        _best, _value = build()
+        build_time = time.perf_counter() - start
+        save(path)
+    return _best, _value
+
+
+def save(path=CACHE):
+    """Write the tables to path atomically, ignoring failures.
+
+    They are written to a temporary file then renamed, so processes
+    building at the same time never leave a partial file behind.
+    """
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temp = tempfile.mkstemp(suffix=".npz",
+                                    dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, best=_best, value=_value)
+            os.replace(temp, path)
+        except BaseException:
+            os.remove(temp)
+            raise
+    except OSError:
+        pass
+
+
+def best_move(state):
+    """Best square to play for the player to move, by table lookup."""
+    best, value = load()
+    move = int(best[key(state)])
+    if move < 0:
+        raise ValueError("No move: game is over or position is unreachable")
+    return move
+
+
+def value(state):
+    """Value of a position for the player to move (positive wins)."""
+    best, value = load()
+    return int(value[key(state)])
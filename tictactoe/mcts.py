@@ -0,0 +1,236 @@
+"""Monte Carlo tree search for k in a row games on large boards."""
+from concurrent.futures import ProcessPoolExecutor
+import math
+import time
+
+import numpy as np
+
+from tictactoe.bitboard import Board, win_masks
+
+# tree kept by each process pool worker between moves
+_worker = None
+
+
+def line_squares(m=3, n=3, k=3):
+    """Squares of every line as an (lines, k) array."""
+    masks = win_masks(m, n, k)[0]
+    return np.array([[s for s in range(0, m * n) if mask >> s & 1]
+                     for mask in masks], dtype=np.intp).reshape(-1, k)
+
+
+def playouts(state, lines, player, count, rng):
+    """Play count random games from state with player to move.
+
+    state is an array of 1, -1 and 0 squares. Every game is played at once
+    by giving each empty square a random move time, then finding the first
+    time each player completes a line. Returns p1 wins, p2 wins and draws.
+    """
+    empty = np.flatnonzero(state == 0)
+    order = np.argsort(rng.random((count, len(empty))), axis=1)
+    squares = empty[order]
+    rows = np.arange(count)[:, None]
+    # time each square is played (-1 if already taken) and its owner
+    times = np.full((count, len(state)), -1, dtype=np.int32)
+    times[rows, squares] = np.arange(len(empty))
+    owner = np.repeat(state[None, :], count, axis=0)
+    owner[rows, squares] = np.where(np.arange(len(empty)) % 2 == 0,
+                                    player, -player)
+    line_owner = owner[:, lines]
+    line_time = times[:, lines].max(axis=-1)
+    never = len(empty)
+    first = [np.where((line_owner == p).all(axis=-1), line_time, never)
+             .min(axis=-1) for p in (1, -1)]
+    p1 = int(np.count_nonzero(first[0] < first[1]))
+    p2 = int(np.count_nonzero(first[1] < first[0]))
+    return p1, p2, count - p1 - p2
+
+
+class Node():
+    """Search tree node for the position after move."""
+
+    __slots__ = ("move", "parent", "player", "children", "untried",
+                 "visits", "score")
+
+    def __init__(self, move, parent, player, untried):
+        self.move = move
+        self.parent = parent
+        # player (1 or -1) who made move, score is from their view
+        self.player = player
+        self.children = []
+        self.untried = untried
+        self.visits = 0
+        self.score = 0.0
+
+    def select(self, c):
+        """Child with the highest upper confidence bound."""
+        log_visits = math.log(self.visits)
+        return max(self.children, key=lambda child: (
+            child.score / child.visits
+            + c * math.sqrt(log_visits / child.visits)))
+
+
+class MCTS():
+    """Monte Carlo tree search player that keeps its tree between moves.
+
+    Each leaf is evaluated by batch random playouts in one NumPy call. With
+    processes above one, independent searches run in a process pool and
+    their root visit counts are summed (root parallelism).
+    """
+
+    def __init__(self, m=3, n=3, k=3, batch=64, c=1.4, seed=None,
+                 processes=1):
+        self.board = Board(m, n, k)
+        self.lines = line_squares(m, n, k)
+        self.batch = batch
+        self.c = c
+        self.rng = np.random.default_rng(seed)
+        self.processes = processes
+        self.pool = None
+        self.root = self.new_root()
+        # rollouts and seconds spent by the last search
+        self.rollouts = 0
+        self.elapsed = 0.0
+
+    def new_root(self):
+        """Fresh tree at the current position."""
+        moves = self.board.legal_moves()
+        self.rng.shuffle(moves)
+        return Node(None, None, -self.board.to_move(), moves)
+
+    @property
+    def rate(self):
+        """Rollouts per second of the last search."""
+        return self.rollouts / self.elapsed if self.elapsed else 0.0
+
+    def over(self):
+        """Check if the game has finished."""
+        return self.board.last_move_won() or self.board.is_full()
+
+    def play(self, move):
+        """Play a move, keeping the subtree below it."""
+        self.board.play(move)
+        for child in self.root.children:
+            if child.move == move:
+                child.parent = None
+                self.root = child
+                return
+        self.root = self.new_root()
+
+    def evaluate(self):
+        """Playout results (p1, p2, draws) at the current position."""
+        board = self.board
+        if board.last_move_won():
+            winner = -board.to_move()
+            if winner == 1:
+                return self.batch, 0, 0
+            return 0, self.batch, 0
+        if board.is_full():
+            return 0, 0, self.batch
+        state = np.array(board.to_state(), dtype=np.int8)
+        return playouts(state, self.lines, board.to_move(), self.batch,
+                        self.rng)
+
+    def iterate(self):
+        """One selection, expansion, playout batch and backup."""
+        board = self.board
+        node = self.root
+        depth = 0
+        # select down to a node with untried moves or the end of the game
+        while not node.untried and node.children and not self.over():
+            node = node.select(self.c)
+            board.play(node.move)
+            depth += 1
+        # expand one move
+        if node.untried and not self.over():
+            move = node.untried.pop()
+            board.play(move)
+            depth += 1
+            untried = [] if self.over() else board.legal_moves()
+            self.rng.shuffle(untried)
+            child = Node(move, node, -board.to_move(), untried)
+            node.children.append(child)
+            node = child
+        p1, p2, draws = self.evaluate()
+        # back up: wins count 1 and draws a half for the player who moved
+        while node is not None:
+            node.visits += self.batch
+            wins = p1 if node.player == 1 else p2
+            node.score += wins + 0.5 * draws
+            node = node.parent
+        for _ in range(0, depth):
+            board.undo()
+
+    def search(self, iterations=None, seconds=None):
+        """Grow the tree for a number of iterations or seconds."""
+        if iterations is None and seconds is None:
+            iterations = 1000
+        start = time.perf_counter()
+        done = 0
+        while ((iterations is None or done < iterations)
+               and (seconds is None or time.perf_counter() - start < seconds)):
+            self.iterate()
+            done += 1
+        self.elapsed = time.perf_counter() - start
+        self.rollouts = done * self.batch
+
+    def visits(self):
+        """Visit count of each move at the root."""
+        return {child.move: child.visits for child in self.root.children}
+
+    def best_move(self, iterations=None, seconds=None):
+        """Search and return the most visited move."""
+        if self.processes > 1:
+            visits = self.parallel_search(iterations, seconds)
+        else:
+            self.search(iterations, seconds)
+            visits = self.visits()
+        return max(visits, key=visits.get)
+
+    def parallel_search(self, iterations=None, seconds=None):
+        """Run a search per process and sum the root visit counts."""
+        if self.pool is None:
+            self.pool = ProcessPoolExecutor(self.processes)
+        board = self.board
+        seeds = np.random.SeedSequence(
+            int(self.rng.integers(2 ** 32))).spawn(self.processes)
+        jobs = [(board.m, board.n, board.k, list(board.moves), self.batch,
+                 self.c, seed, iterations, seconds) for seed in seeds]
+        start = time.perf_counter()
+        visits = {}
+        self.rollouts = 0
+        for result, rollouts in self.pool.map(_search_worker, jobs):
+            self.rollouts += rollouts
+            for move, count in result.items():
+                visits[move] = visits.get(move, 0) + count
+        self.elapsed = time.perf_counter() - start
+        return visits
+
+    def close(self):
+        """Shut down the process pool."""
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+
+
+def _search_worker(args):
+    """Process pool entry point: search from a move history.
+
+    Each worker keeps its tree and reuses it when the history extends the
+    one it last searched. A worker may run several jobs of one search, so
+    only the visits added by this job are returned.
+    """
+    global _worker
+    m, n, k, moves, batch, c, seed, iterations, seconds = args
+    tree = _worker
+    if (tree is None or (tree.board.m, tree.board.n, tree.board.k)
+            != (m, n, k) or tree.board.moves != moves[:len(tree.board.moves)]):
+        tree = MCTS(m, n, k, batch, c)
+    tree.rng = np.random.default_rng(seed)
+    for move in moves[len(tree.board.moves):]:
+        tree.play(move)
+    before = tree.visits()
+    tree.search(iterations, seconds)
+    _worker = tree
+    added = {move: count - before.get(move, 0)
+             for move, count in tree.visits().items()}
+    return added, tree.rollouts
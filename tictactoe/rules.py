@@ -0,0 +1,12 @@
+"""Winning lines of 3 x 3 tic tac toe, kept free of numpy for start up."""
+LINES = [[0, 1, 2], [3, 4, 5], [6, 7, 8],
+         [0, 3, 6], [1, 4, 7], [2, 5, 8],
+         [0, 4, 8], [2, 4, 6]]
+
+
+def winner(state):
+    """Return 1 or -1 if that player has a line, otherwise 0."""
+    for a, b, c in LINES:
+        if state[a] != 0 and state[a] == state[b] == state[c]:
+            return state[a]
+    return 0
@@ -1,4 +1,6 @@
 """Play tic tac toe / noughts and crosses."""
+from games.instrument import timed
+from tictactoe.rules import winner
 
 
 def printstate(state, format=True):
@@ -14,22 +16,35 @@ def printstate(state, format=True):
 
 def check(state):
     """Check the state of the game for winning positions."""
-    solves = [[0, 1, 2], [3, 4, 5], [6, 7, 8],
-              [0, 3, 6], [1, 4, 7], [2, 5, 8],
-              [0, 4, 8], [2, 4, 6]]
-    scores = [sum([state[j] for j in solves[i]]) for i in range(0, 8)]
-    if 3 in scores:
+    result = winner(state)
+    if result == 1:
         print("p1 wins")
         return False
-    elif -3 in scores:
+    elif result == -1:
         print("p2 wins")
         return False
     else:
         return True
 
 
-def game():
-    """Play a game of tictactoe via user input."""
+def user_square(state, player):
+    """Ask a player for a square until an empty one on the board is given."""
+    while True:
+        text = input(f"{player} enter a square to play: ").strip()
+        if text.isdigit() and int(text) < 9 and state[int(text)] == 0:
+            return int(text)
+        print("Choose an empty square between 0 and 8")
+
+
+def game(computer=None, stats=None):
+    """Play a game of tictactoe via user input.
+
+    computer is 1 or -1 to let the engine play as p1 or p2. stats is an
+    optional games.instrument.Stats to record timings in.
+    """
+    if computer is not None:
+        # numpy and the lookup tables only load when the engine plays
+        from tictactoe.engine import best_move
     gamestate = [0, 0, 0, 0, 0, 0, 0, 0, 0]
     game = True
 
@@ -39,16 +54,30 @@ def game():
     while game:
 
         # p1 move
-        pos = int(input("p1 enter a square to play: "))
+        if computer == 1:
+            pos = timed(stats, "engine", best_move, gamestate)
+        else:
+            pos = timed(stats, "input", user_square, gamestate, "p1")
         gamestate[pos] = 1
         printstate(gamestate)
 
-        game = check(gamestate)
+        game = timed(stats, "check", check, gamestate)
+        if stats is not None:
+            stats.move()
+
+        if game and 0 not in gamestate:
+            print("draw")
+            game = False
 
         if game:
             # p2 move
-            pos = int(input("p2 enter a square to play: "))
+            if computer == -1:
+                pos = timed(stats, "engine", best_move, gamestate)
+            else:
+                pos = timed(stats, "input", user_square, gamestate, "p2")
             gamestate[pos] = -1
             printstate(gamestate)
 
-            game = check(gamestate)
+            game = timed(stats, "check", check, gamestate)
+            if stats is not None:
+                stats.move()